@@ -0,0 +1,59 @@
+"""
+Benchmark parallel search index building.
+
+Generates a synthetic dictionary and times build_index with 1, 2, 4 and 8
+workers, reporting the speedup over the single-process build.
+
+Usage:
+    python benchmarks/bench_index_build.py [--terms N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.search_index import build_index
+
+WORDS = [
+    "abstract", "binary", "cache", "data", "element", "function", "graph",
+    "hash", "index", "join", "kernel", "latency", "memory", "node", "object",
+    "pointer", "query", "record", "stack", "thread", "unicode", "vector",
+    "window", "xml", "yield", "zone",
+]
+
+
+def make_dictionary(size: int) -> dict:
+    """Create a synthetic dictionary with the given number of terms."""
+    rng = random.Random(0)
+    return {
+        f"term{i} {rng.choice(WORDS)}": {
+            "definition": " ".join(rng.choice(WORDS) for _ in range(30)),
+            "labels": rng.sample(WORDS, 2),
+        }
+        for i in range(size)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--terms", type=int, default=200000)
+    args = parser.parse_args()
+
+    dictionary = make_dictionary(args.terms)
+    print(f"{args.terms} terms, {os.cpu_count()} CPUs")
+
+    baseline = None
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        build_index(dictionary, workers=workers, threshold=0)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"workers={workers}: {elapsed:.2f}s (x{baseline / elapsed:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark plain JSON against block-compressed storage.
+
+Generates a synthetic dictionary with prose definitions and reports load
+time, save time and size on disk for data.json and for .dictz files using
+zlib and lzma, plus the time to read a single entry from a compressed file.
+
+Usage:
+    python benchmarks/bench_storage.py [--terms N] [--block-size N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_manager import JsonDataManager, BlockCompressedDataManager
+
+WORDS = (
+    "the a of to and in is that for it as with was on by be this which or from "
+    "an are at have not but its one all can been more has their also when used "
+    "term value system data process function structure method language memory"
+).split()
+
+
+def make_dictionary(size: int) -> dict:
+    """Create a synthetic dictionary with prose-like definitions."""
+    rng = random.Random(0)
+    return {
+        f"term {i}": {
+            "definition": " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 120))),
+            "labels": rng.sample(WORDS, 2),
+        }
+        for i in range(size)
+    }
+
+
+def timed(function, *args):
+    """Run a function and return its result and elapsed seconds."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--terms", type=int, default=100000)
+    parser.add_argument("--block-size", type=int, default=64)
+    args = parser.parse_args()
+
+    dictionary = make_dictionary(args.terms)
+    probe = f"term {args.terms // 2}"
+    print(f"{args.terms} terms, block size {args.block_size}")
+    print(f"{'format':<12}{'save s':>10}{'load s':>10}{'size KiB':>12}{'one entry ms':>14}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        formats = [
+            ("json", "data.json", lambda: JsonDataManager("data.json")),
+            ("dictz/zlib", "data.dictz",
+             lambda: BlockCompressedDataManager("data.dictz", "zlib", args.block_size)),
+            ("dictz/lzma", "data.xz.dictz",
+             lambda: BlockCompressedDataManager("data.xz.dictz", "lzma", args.block_size)),
+        ]
+        for name, filename, create in formats:
+            with patch("src.data_manager.app_data_path", lambda path: os.path.join(directory, path)):
+                manager = create()
+            _, save_time = timed(manager.save, dictionary)
+            loaded, load_time = timed(manager.load)
+            assert loaded == dictionary
+            size = os.path.getsize(manager.filepath) / 1024
+            entry = ""
+            if isinstance(manager, BlockCompressedDataManager):
+                _, entry_time = timed(manager.read_entry, probe)
+                entry = f"{entry_time * 1000:.2f}"
+            print(f"{name:<12}{save_time:>10.2f}{load_time:>10.2f}{size:>12,.0f}{entry:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,12 @@ Email: keithwalsh@gmail.com
 GitHub: https://github.com/keithwalsh/dictionary-app
 """
 
+import multiprocessing
 import sys
 import tkinter as tk
 from typing import NoReturn
 
+from src.cli import build_parser, parse_args
 from src.gui import DictionaryApp
 
 
@@ -22,16 +24,22 @@ def main() -> NoReturn:
     
     Creates the main Tkinter window, initializes the application instance,
     and starts the main event loop. This function never returns normally
-    as it enters the Tkinter main loop.
+    as it enters the Tkinter main loop. When a command is given on the
+    command line, it is run instead of opening the window. Dictionaries
+    given with --mount are searched alongside the data file.
     
     Raises:
         TclError: If the Tkinter initialization fails
         ImportError: If required modules cannot be imported
     """
+    args = parse_args(build_parser())
+    if args.command is not None:
+        sys.exit(args.handler(args))
+
     try:
         root = tk.Tk()
         root.title("Dictionary Application")
-        app = DictionaryApp(root)
+        app = DictionaryApp(root, args.data, args.mounts)
         root.mainloop()
     except tk.TclError as e:
         print(f"Failed to initialize Tkinter: {e}", file=sys.stderr)
@@ -42,4 +50,6 @@ def main() -> NoReturn:
 
 
 if __name__ == "__main__":
+    # Index building uses worker processes, which frozen builds must bootstrap
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
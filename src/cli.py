@@ -0,0 +1,166 @@
+import argparse
+from typing import List, Optional, Tuple
+from .data_manager import BlockCompressedDataManager, BLOCK_COMPRESSED_EXTENSION
+from .dictionary_manager import DictionaryManager
+from .diagnostics import memory_report, format_memory_report
+from .federation import DictionaryFederation
+
+
+def _find_duplicates(args: argparse.Namespace) -> int:
+    """Print clusters of terms with near-duplicate definitions."""
+    manager = DictionaryManager(args.data)
+    clusters = manager.find_duplicates(args.threshold)
+    for number, cluster in enumerate(clusters, 1):
+        print(f"Cluster {number}: " + ", ".join(cluster))
+    if not clusters:
+        print("No near-duplicate definitions found.")
+    # Finish any index rebuild so its cache spares the next run the rebuild
+    manager.wait_for_index()
+    return 0
+
+
+def _report_memory(args: argparse.Namespace) -> int:
+    """Print the memory footprint of the loaded dictionary."""
+    print(format_memory_report(memory_report(args.data)))
+    return 0
+
+
+def _convert(args: argparse.Namespace) -> int:
+    """Save the dictionary to another file, converting its storage format."""
+    manager = DictionaryManager(args.data)
+    manager.export(args.target, args.codec)
+    print(f"Saved {args.data} as {args.target}")
+    manager.wait_for_index()
+    return 0
+
+
+def _search(args: argparse.Namespace) -> int:
+    """Print matching terms from the data file and any mounted dictionaries."""
+    federation = DictionaryFederation()
+    try:
+        federation.mount(args.data, args.data)
+        for name, filename in args.mounts:
+            federation.mount(name, filename)
+
+        if args.words:
+            results = federation.search_words(args.text)
+        else:
+            results = federation.search_terms(args.text)
+        for source, term, term_data in results:
+            print(f"[{source}] {term}: {term_data['definition']}")
+        if not results:
+            print("No matching terms found.")
+        for name in [args.data] + [name for name, _ in args.mounts]:
+            if federation.is_open(name):
+                federation.get(name).wait_for_index()
+    finally:
+        federation.close()
+    return 0
+
+
+def _parse_mount(value: str) -> Tuple[str, str]:
+    """Split a --mount value of the form [NAME=]FILE into a name and file."""
+    name, separator, filename = value.partition("=")
+    if not separator:
+        return value, value
+    return name, filename
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the command line parser.
+
+    Returns:
+        argparse.ArgumentParser: Parser with a global data file option and
+        one subcommand per report.
+    """
+    parser = argparse.ArgumentParser(
+        prog="dictionary-app",
+        description="Run without a command to open the dictionary window."
+    )
+    parser.add_argument(
+        "--data", default="data.json",
+        help="dictionary file; use a .dictz name for compressed storage (default: data.json)"
+    )
+    parser.add_argument(
+        "--mount", action="append", default=[], metavar="[NAME=]FILE",
+        help="also search this dictionary file, loading it only when searched; may be repeated"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    duplicates = subparsers.add_parser(
+        "duplicates", help="list terms with near-duplicate definitions"
+    )
+    duplicates.add_argument(
+        "--threshold", type=float, default=0.8,
+        help="minimum similarity of definitions, from 0 to 1 (default: 0.8)"
+    )
+    duplicates.set_defaults(handler=_find_duplicates)
+
+    memory = subparsers.add_parser(
+        "memory", help="report the memory used by the loaded dictionary"
+    )
+    memory.set_defaults(handler=_report_memory)
+
+    convert = subparsers.add_parser(
+        "convert", help="save the dictionary to another file, e.g. data.dictz for compressed storage"
+    )
+    convert.add_argument("target", help="file to write; its extension selects the format")
+    convert.add_argument(
+        "--codec", choices=sorted(BlockCompressedDataManager.CODECS),
+        help="compression for a .dictz target; lzma is smaller, zlib faster (default: zlib)"
+    )
+    convert.set_defaults(handler=_convert)
+
+    search = subparsers.add_parser(
+        "search", help="search terms across the data file and other mounted dictionaries"
+    )
+    search.add_argument("text", help="text to search for")
+    search.add_argument(
+        "--words", action="store_true",
+        help="match words in terms and definitions instead of text within terms"
+    )
+    search.set_defaults(handler=_search)
+    return parser
+
+
+def parse_args(parser: argparse.ArgumentParser, argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line and the dictionaries mounted with --mount.
+
+    Args:
+        parser: Parser created by build_parser.
+        argv: Command line arguments, excluding the program name.
+
+    Returns:
+        argparse.Namespace: The parsed arguments, with ``mounts`` holding a
+        (name, file) pair per --mount option.
+    """
+    args = parser.parse_args(argv)
+    args.mounts = []
+    names = {args.data}
+    for value in args.mount:
+        name, filename = _parse_mount(value)
+        if not name or not filename:
+            parser.error(f"argument --mount: expected [NAME=]FILE, got '{value}'")
+        if name in names:
+            parser.error(f"argument --mount: a dictionary is already mounted as '{name}'")
+        names.add(name)
+        args.mounts.append((name, filename))
+    if args.command == "convert" and args.codec and not args.target.endswith(BLOCK_COMPRESSED_EXTENSION):
+        parser.error(f"argument --codec: only applies to {BLOCK_COMPRESSED_EXTENSION} targets")
+    return args
+
+
+def run_cli(argv: Optional[List[str]] = None) -> int:
+    """Run a command line report.
+
+    Args:
+        argv: Command line arguments, excluding the program name.
+
+    Returns:
+        int: Process exit status.
+    """
+    parser = build_parser()
+    args = parse_args(parser, argv)
+    if args.command is None:
+        parser.error("a command is required")
+    return args.handler(args)
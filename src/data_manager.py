@@ -1,8 +1,69 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, IO, Iterator, Callable, Optional, Tuple
+from contextlib import contextmanager
+import hashlib
 import json
+import lzma
 import os
+import struct
+import threading
+import zlib
 from .utils import app_data_path
 
+# Data files with this extension use BlockCompressedDataManager
+BLOCK_COMPRESSED_EXTENSION = '.dictz'
+
+
+@contextmanager
+def atomic_open(filepath: str, mode: str = 'w', encoding: Optional[str] = None) -> Iterator[IO]:
+    """Open a temporary file that atomically replaces filepath once written.
+    
+    The data is flushed and fsynced before the rename, so a crash leaves
+    either the old file or the complete new one, never a partial write.
+    
+    Args:
+        filepath: The file to replace.
+        mode: Write mode, 'w' or 'wb'.
+        encoding: Text encoding for text mode.
+    
+    Yields:
+        IO: The temporary file to write to.
+    """
+    tmp_path = filepath + '.tmp'
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def file_fingerprint(filepath: str, content: bytes) -> Optional[Dict[str, Any]]:
+    """Identify a version of a file by its size, modification time and content.
+    
+    Args:
+        filepath: Path of the file.
+        content: The file's content, as read or written.
+    
+    Returns:
+        Optional[Dict[str, Any]]: The size, mtime_ns and sha256 of the file,
+        or None if it does not exist.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(content).hexdigest()
+    }
+
+
 class JsonDataManager:
     """Handles JSON file operations for data persistence.
     
@@ -17,6 +78,10 @@ class JsonDataManager:
             filename: Name of the JSON file to manage.
         """
         self.filepath = app_data_path(filename)
+        # Fingerprint of the file as last loaded or saved, used to validate caches
+        self.fingerprint: Optional[Dict[str, Any]] = None
+        # Serializes saves from the UI thread and the background saver
+        self._save_lock = threading.Lock()
     
     def load(self) -> Dict[str, Dict[str, Any]]:
         """Load data from JSON file with UTF-8 encoding.
@@ -30,17 +95,281 @@ class JsonDataManager:
                 }
             }
         """
+        self.fingerprint = None
         try:
             with open(self.filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                text = f.read()
+            data = json.loads(text)
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
+        self.fingerprint = file_fingerprint(self.filepath, text.encode('utf-8'))
+        return data
     
     def save(self, data: Dict[str, Any]) -> None:
         """Save data to JSON file with UTF-8 encoding.
         
+        The file is replaced atomically, and concurrent calls are serialized,
+        so it is safe to call from a background thread.
+        
         Args:
             data: Dictionary containing data to save.
         """
-        with open(self.filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False) 
\ No newline at end of file
+        text = json.dumps(data, ensure_ascii=False)
+        with self._save_lock:
+            with atomic_open(self.filepath, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.fingerprint = file_fingerprint(self.filepath, text.encode('utf-8'))
+
+
+class BackgroundSaver:
+    """Runs saves on a background thread, coalescing overlapping requests.
+    
+    While a save is in flight, further requests replace one another so only
+    the most recent snapshot is written next. The worker is not a daemon
+    thread, so the program finishes queued saves before it exits.
+    """
+    
+    def __init__(self, save: Callable[[Any], None]) -> None:
+        """Initialize the saver.
+        
+        Args:
+            save: Function that writes a snapshot; called on the worker thread.
+        """
+        self._save = save
+        self._lock = threading.Lock()
+        self._pending: Any = None
+        self._has_pending = False
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+    
+    @property
+    def busy(self) -> bool:
+        """bool: Whether a save is queued or in flight."""
+        with self._lock:
+            return self._thread is not None
+    
+    def request(self, snapshot: Any) -> None:
+        """Queue a snapshot to be saved in the background.
+        
+        Args:
+            snapshot: Data to pass to the save function. It must not be
+                modified after being handed over.
+        """
+        with self._lock:
+            self._pending = snapshot
+            self._has_pending = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="dictionary-save")
+                self._thread.start()
+    
+    def wait(self) -> None:
+        """Block until queued and in-flight saves have finished."""
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+    
+    def _run(self) -> None:
+        """Save queued snapshots until none are left."""
+        while True:
+            with self._lock:
+                if not self._has_pending:
+                    self._thread = None
+                    return
+                snapshot = self._pending
+                self._pending = None
+                self._has_pending = False
+            try:
+                self._save(snapshot)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e 
+
+class BlockCompressedDataManager:
+    """Handles compressed, block-structured storage for data persistence.
+    
+    Terms are grouped in their stored order into blocks of ``block_size``
+    entries, and each block is compressed on its own with zlib or lzma. A
+    compressed header lists the terms in each block with the block's offset,
+    so a single entry can be read by decompressing just one block.
+    
+    File layout: magic, codec name length and name, header length, the
+    compressed header, then the compressed blocks.
+    """
+    
+    MAGIC = b'DICTBLK1'
+    CODECS = {
+        'zlib': (zlib.compress, zlib.decompress),
+        'lzma': (lzma.compress, lzma.decompress),
+    }
+    
+    def __init__(self, filename: str, codec: str = 'zlib', block_size: int = 64) -> None:
+        """Initialize the block-compressed data manager.
+        
+        Args:
+            filename: Name of the file to manage.
+            codec: Compression used when saving, 'zlib' or 'lzma'. Loading
+                uses whichever codec the file was written with, and later
+                saves keep it.
+            block_size: Number of terms per compressed block.
+        
+        Raises:
+            ValueError: If the codec is not supported.
+        """
+        if codec not in self.CODECS:
+            raise ValueError(f"Unsupported codec: {codec}")
+        self.filepath = app_data_path(filename)
+        self.codec = codec
+        self.block_size = block_size
+        self.fingerprint: Optional[Dict[str, Any]] = None
+        self._save_lock = threading.Lock()
+    
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Load and decompress every block.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Dictionary containing loaded data, in
+            the same structure and order as it was saved.
+        """
+        self.fingerprint = None
+        try:
+            with open(self.filepath, 'rb') as f:
+                content = f.read()
+            codec, header, blocks_start = self._parse_header(content)
+            decompress = self.CODECS[codec][1]
+            data: Dict[str, Dict[str, Any]] = {}
+            for terms, offset, length in header["blocks"]:
+                start = blocks_start + offset
+                entries = self._decode_block(decompress, content[start:start + length])
+                for term, (definition, labels) in zip(terms, entries):
+                    data[term] = {"definition": definition, "labels": labels}
+        except (FileNotFoundError, ValueError):
+            return {}
+        self.codec = codec
+        self.fingerprint = file_fingerprint(self.filepath, content)
+        return data
+    
+    def read_entry(self, term: str) -> Optional[Dict[str, Any]]:
+        """Read a single term by decompressing only the block that holds it.
+        
+        Args:
+            term: The term to read.
+        
+        Returns:
+            Optional[Dict[str, Any]]: The term's definition and labels, or
+            None if the file or term does not exist.
+        """
+        try:
+            with open(self.filepath, 'rb') as f:
+                # Read only the prefix and header: magic, codec name, header length, header
+                prefix = f.read(len(self.MAGIC) + 1)
+                if len(prefix) < len(self.MAGIC) + 1 or not prefix.startswith(self.MAGIC):
+                    return None
+                prefix += f.read(prefix[-1] + 8)
+                header_length = struct.unpack('<Q', prefix[-8:])[0]
+                if header_length > os.fstat(f.fileno()).st_size:
+                    return None
+                codec, header, blocks_start = self._parse_header(prefix + f.read(header_length))
+                decompress = self.CODECS[codec][1]
+                for terms, offset, length in header["blocks"]:
+                    if term in terms:
+                        f.seek(blocks_start + offset)
+                        entries = self._decode_block(decompress, f.read(length))
+                        definition, labels = entries[terms.index(term)]
+                        return {"definition": definition, "labels": labels}
+        except (FileNotFoundError, ValueError, struct.error):
+            return None
+        return None
+    
+    def save(self, data: Dict[str, Any]) -> None:
+        """Compress data into blocks and save it.
+        
+        The file is replaced atomically, and concurrent calls are serialized,
+        so it is safe to call from a background thread.
+        
+        Args:
+            data: Dictionary containing data to save.
+        """
+        compress = self.CODECS[self.codec][0]
+        items = list(data.items())
+        blocks: List[bytes] = []
+        block_index: List[Any] = []
+        offset = 0
+        for start in range(0, len(items), self.block_size):
+            chunk = items[start:start + self.block_size]
+            entries = [[term_data["definition"], term_data.get("labels", [])] for _, term_data in chunk]
+            block = compress(json.dumps(entries, ensure_ascii=False).encode('utf-8'))
+            block_index.append([[term for term, _ in chunk], offset, len(block)])
+            blocks.append(block)
+            offset += len(block)
+        
+        header = compress(json.dumps({"blocks": block_index}, ensure_ascii=False).encode('utf-8'))
+        codec_name = self.codec.encode('ascii')
+        content = b''.join([
+            self.MAGIC, bytes([len(codec_name)]), codec_name,
+            struct.pack('<Q', len(header)), header
+        ] + blocks)
+        with self._save_lock:
+            with atomic_open(self.filepath, 'wb') as f:
+                f.write(content)
+            self.fingerprint = file_fingerprint(self.filepath, content)
+    
+    def _parse_header(self, content: bytes) -> Tuple[str, Dict[str, Any], int]:
+        """Parse the file prefix up to the end of the header.
+        
+        Args:
+            content: The file's bytes, at least up to the end of the header.
+        
+        Returns:
+            Tuple: The name of the codec, the decoded header and the offset
+            at which the blocks start.
+        
+        Raises:
+            ValueError: If the content is not a valid block-compressed file.
+        """
+        if not content.startswith(self.MAGIC):
+            raise ValueError("Not a block-compressed dictionary file")
+        try:
+            position = len(self.MAGIC)
+            codec_length = content[position]
+            codec = content[position + 1:position + 1 + codec_length].decode('ascii')
+            if codec not in self.CODECS:
+                raise ValueError(f"Unsupported codec: {codec}")
+            decompress = self.CODECS[codec][1]
+            position += 1 + codec_length
+            header_length = struct.unpack('<Q', content[position:position + 8])[0]
+            position += 8
+            header = json.loads(decompress(content[position:position + header_length]))
+            if not isinstance(header, dict) or not all(
+                    isinstance(terms, list) and isinstance(offset, int) and isinstance(length, int)
+                    for terms, offset, length in header["blocks"]):
+                raise ValueError("Invalid block-compressed dictionary header")
+        except (KeyError, TypeError) as e:
+            raise ValueError("Invalid block-compressed dictionary header") from e
+        except (IndexError, UnicodeDecodeError, struct.error, zlib.error, lzma.LZMAError) as e:
+            raise ValueError("Corrupt block-compressed dictionary file") from e
+        return codec, header, position + header_length
+    
+    @staticmethod
+    def _decode_block(decompress: Callable[[bytes], bytes], block: bytes) -> List[List[Any]]:
+        """Decompress and decode one block of entries.
+        
+        Args:
+            decompress: The codec's decompress function.
+            block: The compressed block.
+        
+        Returns:
+            List[List[Any]]: A [definition, labels] pair per term in the block.
+        
+        Raises:
+            ValueError: If the block is corrupt.
+        """
+        try:
+            entries = json.loads(decompress(block))
+            if not isinstance(entries, list) or not all(
+                    isinstance(entry, list) and len(entry) == 2 for entry in entries):
+                raise ValueError("Block entries are not [definition, labels] pairs")
+        except (zlib.error, lzma.LZMAError) as e:
+            raise ValueError("Corrupt block in block-compressed dictionary file") from e
+        return entries
+
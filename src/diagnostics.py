@@ -0,0 +1,74 @@
+from typing import Dict, Any, List
+import os
+import tracemalloc
+from .dictionary_manager import DictionaryManager
+
+
+def memory_report(filename: str = 'data.json') -> Dict[str, Any]:
+    """Load the dictionary under tracemalloc and report its memory footprint.
+
+    Waits for the search index to be built if it is not loaded from the
+    cache, so the figures include it.
+
+    Args:
+        filename: Name of the data file to load.
+
+    Returns:
+        Dict[str, Any]: Report with the keys
+            "terms": number of loaded terms,
+            "file_size": bytes of the data file on disk,
+            "load_current": bytes still allocated after loading,
+            "load_peak": peak bytes allocated while loading,
+            "breakdown": bytes per structure from DictionaryManager.memory_usage,
+            "total": sum of the breakdown,
+            "bytes_per_term": total divided by the number of terms.
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    manager = DictionaryManager(filename)
+    manager.wait_for_index()
+    current, peak = tracemalloc.get_traced_memory()
+    if not already_tracing:
+        tracemalloc.stop()
+
+    breakdown = manager.memory_usage()
+    total = sum(breakdown.values())
+    terms = len(manager.get_all_terms())
+    try:
+        file_size = os.path.getsize(manager.filepath)
+    except OSError:
+        file_size = 0
+    return {
+        "terms": terms,
+        "file_size": file_size,
+        "load_current": current - baseline,
+        "load_peak": peak - baseline,
+        "breakdown": breakdown,
+        "total": total,
+        "bytes_per_term": total / terms if terms else 0.0,
+    }
+
+
+def format_memory_report(report: Dict[str, Any]) -> str:
+    """Format a memory report as human-readable text.
+
+    Args:
+        report: A report returned by memory_report.
+
+    Returns:
+        str: One line per measurement.
+    """
+    lines: List[str] = [f"Terms loaded:        {report['terms']:>14,}"]
+    for name, size in report["breakdown"].items():
+        lines.append(f"  {name.replace('_', ' '):<18}{size:>14,} bytes")
+    lines.append(f"Total in memory:     {report['total']:>14,} bytes")
+    lines.append(f"Bytes per term:      {report['bytes_per_term']:>14,.1f}")
+    lines.append(f"Traced after load:   {report['load_current']:>14,} bytes")
+    lines.append(f"Traced peak in load: {report['load_peak']:>14,} bytes")
+    lines.append(f"File size on disk:   {report['file_size']:>14,} bytes")
+    if report["file_size"]:
+        lines.append(f"Memory / disk ratio: {report['total'] / report['file_size']:>14.2f}")
+    return "\n".join(lines)
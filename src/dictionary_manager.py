@@ -1,21 +1,345 @@
-from typing import Dict, List, Set, Optional, Any
-from .data_manager import JsonDataManager
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, List, Set, Optional, Any, Callable, Iterator, Tuple
+from .data_manager import (
+    JsonDataManager, BlockCompressedDataManager, BackgroundSaver, BLOCK_COMPRESSED_EXTENSION
+)
+from .search_index import SearchIndex, ScanIndex, build_index
+from .index_cache import IndexCache, CACHE_THRESHOLD, encode_index
+from .duplicates import find_duplicate_clusters
+from .similarity import SimilarityEngine
+from .history import RevisionHistory
+from .utils import deep_getsizeof
+from .events import ChangeEvent, ChangeKind, coalesce
+
+ChangeListener = Callable[[List[ChangeEvent]], None]
+
+
+def _open_storage(filename: str, codec: Optional[str] = None) -> Any:
+    """Create the data manager for a file based on its extension.
+    
+    Args:
+        filename: Name of the data file; ``.dictz`` files use block-compressed
+            storage and anything else is plain JSON.
+        codec: Compression for a new block-compressed file, 'zlib' or
+            'lzma'; existing files keep the codec they were written with.
+    
+    Returns:
+        JsonDataManager or BlockCompressedDataManager for the file.
+    """
+    if filename.endswith(BLOCK_COMPRESSED_EXTENSION):
+        return BlockCompressedDataManager(filename, codec or 'zlib')
+    return JsonDataManager(filename)
+
 
 class DictionaryManager:
     """Manages dictionary data operations including loading, saving, and modifications.
     
     This class handles all data-related operations for the dictionary application,
-    delegating file I/O operations to the JsonDataManager.
+    delegating file I/O operations to the JsonDataManager, or to the
+    BlockCompressedDataManager for ``.dictz`` files.
+    
+    Every modification emits a ChangeEvent to subscribed listeners. Events are
+    delivered in coalesced batches: at the end of the outermost transaction,
+    on the next call of a dispatcher such as Tk's ``after_idle``, or
+    immediately when neither is in use.
+    
+    Term entries are never modified in place; changes replace the entry. A
+    shallow copy of the dictionary is therefore a consistent snapshot that
+    can be saved on another thread while editing continues.
+    
+    Large dictionaries load their search index from a cache file next to the
+    data file. If the cache is stale, the index is rebuilt on a background
+    thread and queries scan the dictionary until it is ready.
+    
+    Replaced and removed definitions are kept in a revision history file
+    next to the data file, which is only read when history is viewed.
     """
     
-    def __init__(self) -> None:
-        """Initialize the dictionary manager and load existing data."""
-        self._data_manager = JsonDataManager('data.json')
+    def __init__(self, filename: str = 'data.json') -> None:
+        """Initialize the dictionary manager and load existing data.
+        
+        Args:
+            filename: Name of the data file, relative to the application directory.
+        """
+        self._data_manager = _open_storage(filename)
         self._dictionary: Dict[str, Dict[str, Any]] = self._data_manager.load()
+        self._index_cache = IndexCache(self._data_manager.filepath + '.idx')
+        self._cache_fingerprint: Optional[Dict[str, Any]] = None
+        # Background index build, the snapshot it indexes and terms changed since
+        self._index_future: Optional[Future] = None
+        self._index_snapshot: Dict[str, Dict[str, Any]] = {}
+        self._index_backlog: Set[str] = set()
+        self._index = self._open_index()
+        # Built on the first related-terms query, then kept up to date
+        self._similarity: Optional[SimilarityEngine] = None
+        # Background similarity build and the terms changed since its snapshot
+        self._similarity_future: Optional[Future] = None
+        self._similarity_backlog: Set[str] = set()
+        # Runs related-terms queries so that interactive callers need not wait
+        self._related_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dictionary-related")
+        self._history = RevisionHistory(self._data_manager.filepath + '.revisions')
+        self._listeners: List[ChangeListener] = []
+        self._pending_events: List[ChangeEvent] = []
+        self._transaction_depth = 0
+        self._dispatcher: Optional[Callable[[Callable[[], None]], Any]] = None
+        self._flush_scheduled = False
+        # Count of changes started and finished, and the count covered by the last completed save
+        self._generation = 0
+        self._saved_generation = 0
+        self._saver = BackgroundSaver(self._save_snapshot)
+        self._cache_saver = BackgroundSaver(self._save_index_cache)
+    
+    def _open_index(self) -> Any:
+        """Load the search index from the cache, or start building it.
+        
+        Returns:
+            The cached or freshly built SearchIndex, or a ScanIndex that
+            answers queries until a background build completes.
+        """
+        if len(self._dictionary) < CACHE_THRESHOLD:
+            return build_index(self._dictionary)
+        
+        fingerprint = self._data_manager.fingerprint
+        index = self._index_cache.load(fingerprint)
+        if index is not None:
+            self._cache_fingerprint = fingerprint
+            return index
+        
+        self._index_snapshot = dict(self._dictionary)
+        self._index_future = Future()
+        # A daemon, so closing the window does not wait for a long rebuild;
+        # a cache write abandoned by an earlier exit is cleared first, and
+        # short-lived commands call wait_for_index to have the cache written
+        self._index_cache.remove_partial_write()
+        threading.Thread(
+            target=self._build_index_in_background,
+            args=(self._index_future, self._index_snapshot, fingerprint),
+            name="dictionary-index",
+            daemon=True
+        ).start()
+        return ScanIndex(self._dictionary)
+    
+    def _build_index_in_background(self, future: Future, snapshot: Dict[str, Dict[str, Any]],
+                                   fingerprint: Optional[Dict[str, Any]]) -> None:
+        """Build an index over a snapshot and cache it; runs on a worker thread.
+        
+        Args:
+            future: Receives the built index, or the error raised.
+            snapshot: The dictionary contents to index.
+            fingerprint: Fingerprint of the data file the snapshot was loaded from.
+        """
+        try:
+            index = build_index(snapshot)
+            if fingerprint is not None:
+                try:
+                    self._index_cache.save(index, fingerprint)
+                    self._cache_fingerprint = fingerprint
+                except OSError:
+                    pass
+            future.set_result(index)
+        except Exception as e:
+            future.set_exception(e)
+    
+    def wait_for_index(self) -> None:
+        """Block until a background index build has finished, then use its index."""
+        future = self._index_future
+        if future is not None:
+            wait([future])
+        self._sync_index()
+    
+    def _sync_index(self) -> None:
+        """Swap in a finished background index, replaying changes made since its snapshot."""
+        future = self._index_future
+        if future is None or not future.done():
+            return
+        self._index_future = None
+        if future.exception() is not None:
+            index = build_index(self._dictionary)
+        else:
+            index = future.result()
+            for term in self._index_backlog:
+                if term in self._index_snapshot:
+                    index.remove(term, self._index_snapshot[term])
+                if term in self._dictionary:
+                    index.add(term, self._dictionary[term])
+        self._index = index
+        self._index_snapshot = {}
+        self._index_backlog = set()
+    
+    def _save_index_cache(self, saved: Tuple[int, Optional[Dict[str, Any]]]) -> None:
+        """Write the index cache for a saved data file; runs on the cache saver thread.
+        
+        The index is encoded while editing may continue, so the cache is
+        only written if the index matched the saved generation throughout.
+        Otherwise a later save writes it.
+        
+        Args:
+            saved: The generation written and the data file's fingerprint after the write.
+        """
+        generation, fingerprint = saved
+        index = self._index
+        if (generation != self._generation or not isinstance(index, SearchIndex)
+                or fingerprint is None or fingerprint == self._cache_fingerprint
+                or len(index.keys) < CACHE_THRESHOLD):
+            return
+        try:
+            content = encode_index(index)
+        except (RuntimeError, KeyError):
+            # The index changed size or gained a term while being encoded
+            return
+        if generation != self._generation:
+            return
+        try:
+            self._index_cache.write(content, fingerprint)
+            self._cache_fingerprint = fingerprint
+        except OSError:
+            pass
+    
+    @property
+    def filepath(self) -> str:
+        """str: Path of the file the dictionary is stored in."""
+        return self._data_manager.filepath
+    
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Register a listener for batches of change events.
+        
+        Args:
+            listener: Called with the coalesced events of each batch.
+        """
+        self._listeners.append(listener)
+    
+    def unsubscribe(self, listener: ChangeListener) -> None:
+        """Stop delivering change events to a listener.
+        
+        Args:
+            listener: A previously subscribed listener.
+        """
+        self._listeners.remove(listener)
+    
+    def set_dispatcher(self, dispatcher: Optional[Callable[[Callable[[], None]], Any]]) -> None:
+        """Deliver events outside transactions through a scheduling function.
+        
+        Changes made before the scheduled callback runs are delivered together,
+        e.g. passing ``root.after_idle`` batches them per Tk idle cycle.
+        
+        Args:
+            dispatcher: Function that schedules a callback, or None to deliver
+                events as soon as they happen.
+        """
+        self._dispatcher = dispatcher
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group changes so listeners receive them as a single batch.
+        
+        Transactions may be nested; events are delivered when the outermost
+        one ends.
+        """
+        self._transaction_depth += 1
+        try:
+            yield
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.flush_events()
+    
+    def flush_events(self) -> None:
+        """Deliver all pending change events to listeners now."""
+        self._flush_scheduled = False
+        events = coalesce(self._pending_events)
+        self._pending_events = []
+        if events:
+            for listener in list(self._listeners):
+                listener(events)
+    
+    def _begin_change(self) -> None:
+        """Count a change as started; _emit counts it as finished.
+        
+        A cache write on another thread that sees the same generation before
+        and after encoding the index knows no change overlapped it.
+        """
+        self._generation += 1
+    
+    def _emit(self, kind: ChangeKind, term: str) -> None:
+        """Queue a change event and schedule its delivery.
+        
+        Args:
+            kind: What happened to the term.
+            term: The term that changed.
+        """
+        self._generation += 1
+        if self._index_future is not None:
+            self._index_backlog.add(term)
+        if self._similarity_future is not None:
+            self._similarity_backlog.add(term)
+        self._pending_events.append(ChangeEvent(kind, term))
+        if self._transaction_depth:
+            return
+        if self._dispatcher is None:
+            self.flush_events()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._dispatcher(self.flush_events)
+    
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """bool: Whether changes were made since the last completed save."""
+        return self._generation != self._saved_generation
+    
+    @property
+    def last_save_error(self) -> Optional[Exception]:
+        """Optional[Exception]: Error raised by the latest background save, or None if it succeeded."""
+        return self._saver.last_error
     
     def save_data(self) -> None:
-        """Save dictionary data to storage."""
-        self._data_manager.save(self._dictionary)
+        """Save dictionary data to storage.
+        
+        Waits for an in-flight background save, then writes only if changes
+        remain unsaved. The index cache is then brought up to date with the
+        saved file on a background thread, so the next start can skip
+        rebuilding the index without the caller waiting for it.
+        """
+        self._saver.wait()
+        self._sync_index()
+        if self.has_unsaved_changes:
+            self._save_snapshot((self._generation, self._dictionary))
+        else:
+            self._cache_saver.request((self._saved_generation, self._data_manager.fingerprint))
+    
+    def export(self, filename: str, codec: Optional[str] = None) -> None:
+        """Save a copy of the dictionary to another file.
+        
+        Args:
+            filename: Name of the file to write; its extension selects the format.
+            codec: Compression for a ``.dictz`` file, 'zlib' (the default) or 'lzma'.
+        """
+        _open_storage(filename, codec).save(self._dictionary)
+    
+    def save_in_background(self) -> None:
+        """Save a snapshot of the dictionary on a background thread.
+        
+        Returns immediately. Requests made while a save is in flight are
+        coalesced into one save of the latest snapshot.
+        """
+        if self.has_unsaved_changes:
+            self._saver.request((self._generation, dict(self._dictionary)))
+    
+    def _save_snapshot(self, snapshot: Tuple[int, Dict[str, Dict[str, Any]]]) -> None:
+        """Write a snapshot and record the generation it covers.
+        
+        Args:
+            snapshot: The change count and dictionary contents to save.
+        """
+        generation, dictionary = snapshot
+        self._data_manager.save(dictionary)
+        # Revisions made after the snapshot have deltas against definitions
+        # it does not hold, so they wait for the next save
+        self._history.save(generation)
+        self._saved_generation = generation
+        self._cache_saver.request((generation, self._data_manager.fingerprint))
     
     def add_term(self, term: str, definition: str, labels: Optional[List[str]] = None) -> None:
         """Add a new term and definition to the dictionary.
@@ -25,10 +349,22 @@ class DictionaryManager:
             definition: The definition of the term.
             labels: Optional list of labels for the term.
         """
+        self._begin_change()
+        kind = ChangeKind.TERM_ADDED
+        if term in self._dictionary:
+            self._index.remove(term, self._dictionary[term])
+            self._history.record_change(term, self._dictionary[term]["definition"], definition, self._generation)
+            kind = ChangeKind.TERM_UPDATED
+        else:
+            self._history.record_addition(term, definition, self._generation)
         self._dictionary[term] = {
             "definition": definition,
             "labels": labels or []
         }
+        self._index.add(term, self._dictionary[term])
+        if self._similarity is not None:
+            self._similarity.add(term, definition)
+        self._emit(kind, term)
     
     def remove_term(self, term: str) -> None:
         """Remove a term from the dictionary.
@@ -36,7 +372,13 @@ class DictionaryManager:
         Args:
             term: The term to remove.
         """
-        del self._dictionary[term]
+        term_data = self._dictionary.pop(term)
+        self._begin_change()
+        self._index.remove(term, term_data)
+        self._history.record_removal(term, term_data["definition"], self._generation)
+        if self._similarity is not None:
+            self._similarity.remove(term)
+        self._emit(ChangeKind.TERM_REMOVED, term)
     
     def get_all_terms(self) -> Dict[str, Dict[str, Any]]:
         """Get all terms and their data.
@@ -54,10 +396,13 @@ class DictionaryManager:
             label: The label to add.
         """
         if term in self._dictionary:
-            if "labels" not in self._dictionary[term]:
-                self._dictionary[term]["labels"] = []
-            if label not in self._dictionary[term]["labels"]:
-                self._dictionary[term]["labels"].append(label)
+            term_data = self._dictionary[term]
+            labels = term_data.get("labels", [])
+            if label not in labels:
+                self._begin_change()
+                self._dictionary[term] = {**term_data, "labels": labels + [label]}
+                self._index.add_label(term, label)
+                self._emit(ChangeKind.LABELS_CHANGED, term)
     
     def remove_label_from_term(self, term: str, label: str) -> None:
         """Remove a label from a term.
@@ -67,7 +412,13 @@ class DictionaryManager:
             label: The label to remove.
         """
         if term in self._dictionary and "labels" in self._dictionary[term]:
-            self._dictionary[term]["labels"].remove(label)
+            term_data = self._dictionary[term]
+            labels = list(term_data["labels"])
+            labels.remove(label)
+            self._begin_change()
+            self._dictionary[term] = {**term_data, "labels": labels}
+            self._index.remove_label(term, label)
+            self._emit(ChangeKind.LABELS_CHANGED, term)
     
     def get_all_labels(self) -> Set[str]:
         """Get all unique labels used in the dictionary.
@@ -75,10 +426,8 @@ class DictionaryManager:
         Returns:
             Set[str]: Set of all unique labels.
         """
-        labels = set()
-        for term_data in self._dictionary.values():
-            labels.update(term_data.get("labels", []))
-        return labels
+        self._sync_index()
+        return self._index.all_labels()
     
     def get_terms_by_labels(self, labels: List[str]) -> Dict[str, Dict[str, Any]]:
         """Get all terms that match any of the provided labels.
@@ -92,12 +441,48 @@ class DictionaryManager:
         if not labels:  # If no labels specified, return all terms
             return dict(self._dictionary)
         
-        filtered_terms = {}
-        for term, term_data in self._dictionary.items():
-            term_labels = term_data.get("labels", [])
-            if any(label in term_labels for label in labels):
-                filtered_terms[term] = term_data
-        return filtered_terms
+        self._sync_index()
+        matches = self._index.find_labels(labels)
+        return {term: term_data for term, term_data in self._dictionary.items() if term in matches}
+    
+    def search_terms(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """Get all terms containing the text, ignoring case and accents.
+        
+        Args:
+            text: The text to search for within terms.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Dictionary of matching terms.
+        """
+        self._sync_index()
+        matches = self._index.find_substring(text)
+        return {term: term_data for term, term_data in self._dictionary.items() if term in matches}
+    
+    def matches_search(self, term: str, text: str) -> bool:
+        """Check whether a term contains the text, ignoring case and accents.
+        
+        Args:
+            term: The term to check.
+            text: The text to search for within the term.
+        
+        Returns:
+            bool: True if the term exists and matches the text.
+        """
+        self._sync_index()
+        return self._index.matches_substring(term, text)
+    
+    def search_words(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """Get all terms whose term or definition contains every word in the text.
+        
+        Args:
+            text: The words to search for.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Dictionary of matching terms.
+        """
+        self._sync_index()
+        matches = self._index.find_words(text)
+        return {term: term_data for term, term_data in self._dictionary.items() if term in matches}
     
     def get_term_definition(self, term: str) -> str:
         """Get the definition for a specific term.
@@ -119,4 +504,156 @@ class DictionaryManager:
         Returns:
             List[str]: The labels associated with the term.
         """
-        return self._dictionary[term].get("labels", []) 
\ No newline at end of file
+        return self._dictionary[term].get("labels", [])
+    
+    def find_duplicates(self, threshold: float = 0.8) -> List[List[str]]:
+        """Find groups of terms with identical or near-identical definitions.
+        
+        Args:
+            threshold: Minimum shingle Jaccard similarity between definitions.
+        
+        Returns:
+            List[List[str]]: Clusters of terms, largest first.
+        """
+        definitions = {term: term_data["definition"] for term, term_data in self._dictionary.items()}
+        return find_duplicate_clusters(definitions, threshold)
+    
+    @property
+    def related_terms_ready(self) -> bool:
+        """bool: Whether related_terms can answer without waiting for the similarity index."""
+        self._sync_similarity()
+        return self._similarity is not None
+    
+    def prepare_related_terms(self) -> None:
+        """Start building the TF-IDF similarity index on a background thread.
+        
+        Does nothing if the index is built or being built. Changes made
+        during the build are applied when it is swapped in.
+        """
+        if self._similarity is not None or self._similarity_future is not None:
+            return
+        self._similarity_future = Future()
+        threading.Thread(
+            target=self._build_similarity_in_background,
+            args=(self._similarity_future, dict(self._dictionary)),
+            name="dictionary-similarity",
+            daemon=True
+        ).start()
+    
+    @staticmethod
+    def _build_similarity_in_background(future: Future, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """Build a similarity index over a snapshot; runs on a worker thread.
+        
+        Args:
+            future: Receives the built engine, or the error raised.
+            snapshot: The dictionary contents to index.
+        """
+        try:
+            engine = SimilarityEngine()
+            engine.build({term: term_data["definition"] for term, term_data in snapshot.items()})
+            future.set_result(engine)
+        except Exception as e:
+            future.set_exception(e)
+    
+    def _sync_similarity(self) -> None:
+        """Swap in a finished similarity index, applying changes made since its snapshot."""
+        future = self._similarity_future
+        if future is None or not future.done():
+            return
+        self._similarity_future = None
+        if future.exception() is not None:
+            engine = SimilarityEngine()
+            engine.build({term: term_data["definition"] for term, term_data in self._dictionary.items()})
+        else:
+            engine = future.result()
+            for term in self._similarity_backlog:
+                if term in self._dictionary:
+                    engine.add(term, self._dictionary[term]["definition"])
+                else:
+                    engine.remove(term)
+        self._similarity = engine
+        self._similarity_backlog = set()
+    
+    def related_terms(self, term: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Find the terms whose definitions are most similar to a term's definition.
+        
+        The TF-IDF similarity index is built on first use and updated as
+        terms are added and removed afterwards. If it is not ready, this
+        waits for it; interactive callers can call prepare_related_terms and
+        check related_terms_ready instead.
+        
+        Args:
+            term: The term to find related terms for.
+            k: Maximum number of related terms.
+        
+        Returns:
+            List[Tuple[str, float]]: (term, cosine similarity) pairs, most similar first.
+        """
+        self.prepare_related_terms()
+        if self._similarity_future is not None:
+            wait([self._similarity_future])
+        self._sync_similarity()
+        return self._similarity.most_similar(term, k)
+    
+    def request_related_terms(self, term: str, k: int = 5) -> Future:
+        """Find related terms on a background thread.
+        
+        Queries run one at a time in the order requested; cancel a returned
+        future that is no longer needed so it does not delay later ones.
+        
+        Args:
+            term: The term to find related terms for.
+            k: Maximum number of related terms.
+        
+        Returns:
+            Future: Resolves to (term, cosine similarity) pairs, most similar first.
+        
+        Raises:
+            RuntimeError: If the similarity index is not ready; see related_terms_ready.
+        """
+        if not self.related_terms_ready:
+            raise RuntimeError("The similarity index is not ready")
+        return self._related_executor.submit(self._similarity.most_similar, term, k)
+    
+    def get_history(self, term: str) -> List[Tuple[float, str]]:
+        """Get the earlier definitions of a term.
+        
+        The revision history is read from disk on the first call.
+        
+        Args:
+            term: The term to get the history of; it may have been removed.
+        
+        Returns:
+            List[Tuple[float, str]]: (time replaced, definition) pairs,
+            newest first.
+        """
+        current = self._dictionary.get(term)
+        return self._history.get_revisions(term, current["definition"] if current else None)
+    
+    def memory_usage(self) -> Dict[str, int]:
+        """Get the memory held by the loaded dictionary, by structure.
+        
+        Objects shared between structures, such as term strings that the
+        indexes also reference, are counted once under the first category.
+        
+        Returns:
+            Dict[str, int]: Bytes used by term keys, per-term entries,
+            definitions, label lists and search indexes.
+        """
+        self.wait_for_index()
+        seen: Set[int] = {id(self._dictionary)}
+        term_keys = sys.getsizeof(self._dictionary)
+        entries = definitions = label_lists = 0
+        for term, term_data in self._dictionary.items():
+            term_keys += deep_getsizeof(term, seen)
+            seen.add(id(term_data))
+            entries += sys.getsizeof(term_data) + sum(deep_getsizeof(key, seen) for key in term_data)
+            definitions += deep_getsizeof(term_data.get("definition"), seen)
+            label_lists += deep_getsizeof(term_data.get("labels"), seen)
+        return {
+            "term_keys": term_keys,
+            "entries": entries,
+            "definitions": definitions,
+            "label_lists": label_lists,
+            "indexes": deep_getsizeof(self._index, seen),
+        }
@@ -0,0 +1,135 @@
+from typing import Dict, List, Optional, Set, Tuple
+import re
+from .utils import normalize_key
+
+SHINGLE_SIZE = 3
+NUM_BINS = 64
+BANDS = 16
+
+_WORD_RE = re.compile(r'\w+')
+_MASK = (1 << 64) - 1
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Split text into overlapping word n-grams.
+
+    Args:
+        text: The text to shingle.
+        size: Number of words per shingle.
+
+    Returns:
+        Set[str]: The normalized shingles. Texts shorter than one shingle
+        yield a single shingle of all their words.
+    """
+    words = _WORD_RE.findall(normalize_key(text))
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(shingle_set: Set[str], num_bins: int = NUM_BINS) -> Optional[List[int]]:
+    """Compute a one-permutation MinHash signature.
+
+    Each shingle is hashed once and the minimum hash is kept per bin, so the
+    cost is linear in the number of shingles rather than shingles times
+    permutations. Empty bins borrow from the next non-empty bin (rotation
+    densification) so short texts still produce full signatures.
+
+    Args:
+        shingle_set: The shingles to sign.
+        num_bins: Signature length.
+
+    Returns:
+        Optional[List[int]]: The signature, or None for an empty set.
+    """
+    if not shingle_set:
+        return None
+    signature: List[Optional[int]] = [None] * num_bins
+    for shingle in shingle_set:
+        value = hash(shingle) & _MASK
+        bin_index = value % num_bins
+        value //= num_bins
+        current = signature[bin_index]
+        if current is None or value < current:
+            signature[bin_index] = value
+    for i in range(num_bins):
+        if signature[i] is None:
+            offset = 1
+            while signature[(i + offset) % num_bins] is None:
+                offset += 1
+            signature[i] = signature[(i + offset) % num_bins] + offset * (_MASK // num_bins)
+    return signature
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    """Compute the Jaccard similarity of two sets.
+
+    Args:
+        first: The first set.
+        second: The second set.
+
+    Returns:
+        float: Size of the intersection divided by size of the union.
+    """
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def find_duplicate_clusters(texts: Dict[str, str], threshold: float = 0.8,
+                            num_bins: int = NUM_BINS, bands: int = BANDS) -> List[List[str]]:
+    """Group keys whose texts are near-duplicates.
+
+    Signatures are split into bands and hashed into buckets (locality
+    sensitive hashing), so only texts sharing a bucket are compared. Each
+    bucket member is checked against the bucket's first member with the exact
+    shingle Jaccard similarity, keeping the work linear even for large
+    buckets of identical texts; matches are joined transitively.
+
+    Args:
+        texts: Mapping of keys (e.g. terms) to the texts to compare.
+        threshold: Minimum Jaccard similarity for two texts to match.
+        num_bins: MinHash signature length.
+        bands: Number of LSH bands; must divide num_bins.
+
+    Returns:
+        List[List[str]]: Clusters of two or more keys, each sorted, largest first.
+    """
+    rows = num_bins // bands
+    shingle_sets: Dict[str, Set[str]] = {}
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+    for key, text in texts.items():
+        shingle_set = shingles(text)
+        signature = minhash_signature(shingle_set, num_bins)
+        if signature is None:
+            continue
+        shingle_sets[key] = shingle_set
+        for band in range(bands):
+            band_key = (band, tuple(signature[band * rows:(band + 1) * rows]))
+            buckets.setdefault(band_key, []).append(key)
+
+    parent: Dict[str, str] = {}
+
+    def find(key: str) -> str:
+        root = key
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while key != root:
+            parent[key], key = root, parent[key]
+        return root
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        first = members[0]
+        for other in members[1:]:
+            if find(first) == find(other):
+                continue
+            if jaccard(shingle_sets[first], shingle_sets[other]) >= threshold:
+                parent[find(other)] = find(first)
+
+    clusters: Dict[str, List[str]] = {}
+    for key in set(parent) | set(parent.values()):
+        clusters.setdefault(find(key), []).append(key)
+    result = [sorted(members) for members in clusters.values()]
+    return sorted(result, key=lambda members: (-len(members), members[0]))
@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List
+
+
+class ChangeKind(Enum):
+    """Kinds of change made to a dictionary term."""
+    TERM_ADDED = "term_added"
+    TERM_REMOVED = "term_removed"
+    TERM_UPDATED = "term_updated"
+    LABELS_CHANGED = "labels_changed"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A change made to a single dictionary term.
+
+    Attributes:
+        kind: What happened to the term.
+        term: The term that changed.
+    """
+    kind: ChangeKind
+    term: str
+
+
+def coalesce(events: List[ChangeEvent]) -> List[ChangeEvent]:
+    """Collapse a batch of events into at most one net event per term.
+
+    A term added and then removed within the batch produces no event, one
+    removed and re-added is reported as updated, and a term whose only
+    changes were to its labels is reported as labels changed. Terms keep
+    the order in which they first changed.
+
+    Args:
+        events: The events in the order they happened.
+
+    Returns:
+        List[ChangeEvent]: The net change for each affected term.
+    """
+    # term -> [existed before the batch, exists after it, only labels changed]
+    states: Dict[str, List[bool]] = {}
+    for event in events:
+        state = states.setdefault(
+            event.term, [event.kind is not ChangeKind.TERM_ADDED, True, True]
+        )
+        state[1] = event.kind is not ChangeKind.TERM_REMOVED
+        if event.kind is not ChangeKind.LABELS_CHANGED:
+            state[2] = False
+
+    coalesced = []
+    for term, (existed, exists, labels_only) in states.items():
+        if not existed and not exists:
+            continue
+        if not existed:
+            kind = ChangeKind.TERM_ADDED
+        elif not exists:
+            kind = ChangeKind.TERM_REMOVED
+        elif labels_only:
+            kind = ChangeKind.LABELS_CHANGED
+        else:
+            kind = ChangeKind.TERM_UPDATED
+        coalesced.append(ChangeEvent(kind, term))
+    return coalesced
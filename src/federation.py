@@ -0,0 +1,163 @@
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Callable
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from .dictionary_manager import DictionaryManager
+
+# (source name, term, term data)
+FederatedResult = Tuple[str, str, Dict[str, Any]]
+
+
+class DictionaryFederation:
+    """Searches several dictionary files as one.
+
+    Dictionaries are mounted under a name and opened only when a query
+    first reaches them. Queries fan out to the mounted dictionaries on a
+    thread pool, and results are merged in mount order with the name of the
+    dictionary each came from.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """Initialize an empty federation.
+
+        Args:
+            max_workers: Maximum number of dictionaries queried at once.
+                Defaults to the ThreadPoolExecutor default.
+        """
+        self._filenames: Dict[str, str] = {}
+        self._managers: Dict[str, DictionaryManager] = {}
+        self._open_locks: Dict[str, threading.Lock] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dictionary-search")
+
+    @property
+    def names(self) -> List[str]:
+        """List[str]: Names of the mounted dictionaries, in mount order."""
+        return list(self._filenames)
+
+    def mount(self, name: str, filename: str) -> None:
+        """Mount a dictionary file without opening it.
+
+        Args:
+            name: Name that identifies the dictionary in results.
+            filename: Path of the data file, absolute or relative to the
+                application directory.
+
+        Raises:
+            ValueError: If a dictionary is already mounted under the name.
+        """
+        if name in self._filenames:
+            raise ValueError(f"A dictionary is already mounted as '{name}'")
+        self._filenames[name] = filename
+        self._open_locks[name] = threading.Lock()
+
+    def unmount(self, name: str) -> None:
+        """Unmount a dictionary, saving it first if it was opened and changed.
+
+        Args:
+            name: Name of the mounted dictionary.
+        """
+        del self._filenames[name]
+        del self._open_locks[name]
+        manager = self._managers.pop(name, None)
+        if manager is not None:
+            manager.save_data()
+
+    def is_open(self, name: str) -> bool:
+        """Check whether a mounted dictionary has been loaded.
+
+        Args:
+            name: Name of the mounted dictionary.
+
+        Returns:
+            bool: True once the dictionary has been opened by a query.
+        """
+        return name in self._managers
+
+    def get(self, name: str) -> DictionaryManager:
+        """Get a mounted dictionary, opening it on first use.
+
+        Args:
+            name: Name of the mounted dictionary.
+
+        Returns:
+            DictionaryManager: The loaded dictionary.
+        """
+        manager = self._managers.get(name)
+        if manager is None:
+            with self._open_locks[name]:
+                manager = self._managers.get(name)
+                if manager is None:
+                    manager = DictionaryManager(self._filenames[name])
+                    self._managers[name] = manager
+        return manager
+
+    def search_terms(self, text: str, sources: Optional[Iterable[str]] = None) -> List[FederatedResult]:
+        """Find terms containing the text, ignoring case and accents, across dictionaries.
+
+        Args:
+            text: The text to search for within terms.
+            sources: Names of the dictionaries to search. Defaults to all.
+
+        Returns:
+            List[FederatedResult]: Matches as (source, term, term data).
+        """
+        return self._fan_out(lambda manager: manager.search_terms(text), sources)
+
+    def search_words(self, text: str, sources: Optional[Iterable[str]] = None) -> List[FederatedResult]:
+        """Find terms whose term or definition contains every word, across dictionaries.
+
+        Args:
+            text: The words to search for.
+            sources: Names of the dictionaries to search. Defaults to all.
+
+        Returns:
+            List[FederatedResult]: Matches as (source, term, term data).
+        """
+        return self._fan_out(lambda manager: manager.search_words(text), sources)
+
+    def get_terms_by_labels(self, labels: List[str],
+                            sources: Optional[Iterable[str]] = None) -> List[FederatedResult]:
+        """Find terms carrying any of the labels, across dictionaries.
+
+        Args:
+            labels: Labels to filter by; no labels matches every term.
+            sources: Names of the dictionaries to search. Defaults to all.
+
+        Returns:
+            List[FederatedResult]: Matches as (source, term, term data).
+        """
+        return self._fan_out(lambda manager: manager.get_terms_by_labels(labels), sources)
+
+    def save_all(self) -> None:
+        """Save every opened dictionary that has unsaved changes."""
+        for manager in list(self._managers.values()):
+            manager.save_data()
+
+    def close(self) -> None:
+        """Save opened dictionaries and stop the query threads."""
+        self.save_all()
+        self._executor.shutdown()
+
+    def _fan_out(self, query: Callable[[DictionaryManager], Dict[str, Dict[str, Any]]],
+                 sources: Optional[Iterable[str]]) -> List[FederatedResult]:
+        """Run a query on each selected dictionary in parallel and merge the results.
+
+        Args:
+            query: Function run against each dictionary.
+            sources: Names of the dictionaries to query. Defaults to all.
+
+        Returns:
+            List[FederatedResult]: Results in mount order, then in each
+            dictionary's own order.
+        """
+        names = self.names
+        if sources is not None:
+            selected = set(sources)
+            names = [name for name in names if name in selected]
+        futures = [
+            (name, self._executor.submit(lambda name=name: query(self.get(name))))
+            for name in names
+        ]
+        results: List[FederatedResult] = []
+        for name, future in futures:
+            results.extend((name, term, term_data) for term, term_data in future.result().items())
+        return results
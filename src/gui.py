@@ -2,28 +2,73 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 import sys
 import os
-from typing import Optional
+from datetime import datetime
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Any, Tuple
 from .dictionary_manager import DictionaryManager
+from .federation import DictionaryFederation, FederatedResult
+from .events import ChangeEvent, ChangeKind
+
+# How often unsaved changes are written to disk in the background
+AUTOSAVE_INTERVAL_MS = 60000
+
+# Number of entries shown in the related terms panel
+RELATED_TERMS_COUNT = 5
+
+# How often the related terms panel checks whether its index is ready
+RELATED_TERMS_POLL_MS = 200
+
+# How often the related terms panel checks whether its query has finished
+RELATED_TERMS_RESULT_POLL_MS = 20
 
 class DictionaryApp:
     """GUI application for managing a personal dictionary.
     
     This class handles all GUI-related operations and user interactions,
-    delegating data operations to the DictionaryManager.
+    delegating data operations to the DictionaryManager. The treeview and
+    label filters are kept up to date from the manager's change events, once
+    per Tk idle cycle, rather than being redrawn after every operation.
     """
     
-    def __init__(self, root: tk.Tk) -> None:
+    def __init__(self, root: tk.Tk, filename: str = 'data.json',
+                 mounts: Optional[List[Tuple[str, str]]] = None) -> None:
         """Initialize the GUI application.
         
         Args:
             root: The root Tkinter window.
+            filename: Name of the dictionary data file.
+            mounts: Optional (name, file) pairs of other dictionaries that
+                searches and label filters also cover. Each is loaded only
+                when first searched, and its terms are shown read-only.
         """
         self.root = root
-        self.dict_manager = DictionaryManager()
+        self.dict_manager = DictionaryManager(filename)
+        self._filename = filename
+        self._federation: Optional[DictionaryFederation] = None
+        if mounts:
+            self._federation = DictionaryFederation()
+            for name, mount_filename in mounts:
+                self._federation.mount(name, mount_filename)
+        self.dict_manager.set_dispatcher(self.root.after_idle)
+        self.dict_manager.subscribe(self._on_dictionary_changed)
+        
+        # Treeview item id of each displayed term, and the active search or label filter
+        self._term_items: Dict[str, str] = {}
+        # Source name of each displayed row from a mounted dictionary
+        self._mounted_items: Dict[str, str] = {}
+        self._view_search: Optional[str] = None
+        self._view_labels: List[str] = []
+        # Whether the current run of failed autosaves has been reported
+        self._save_error_reported = False
+        # Pending refresh of the related terms panel while its index is built,
+        # and the query whose results it is waiting for
+        self._related_job: Optional[str] = None
+        self._related_future: Optional[Future] = None
         
         self._setup_window()
         self._create_widgets()
         self.populate_treeview()
+        self._autosave_job = self.root.after(AUTOSAVE_INTERVAL_MS, self._autosave)
         
     def _setup_window(self) -> None:
         """Configure the main window properties."""
@@ -83,9 +128,14 @@ class DictionaryApp:
         ttk.Button(button_frame, text="Add Term", command=self.add_term).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Edit Term", command=self.edit_term).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Remove Term", command=self.remove_term).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Find Duplicates", command=self.show_duplicates).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="History", command=self.show_history).pack(side=tk.LEFT, padx=5)
 
         # Create treeview (moved to row 6)
-        self.treeview = ttk.Treeview(main_frame, columns=("Term", "Definition", "Labels"), show="headings")
+        columns = ("Term", "Definition", "Labels")
+        if self._federation is not None:
+            columns += ("Source",)
+        self.treeview = ttk.Treeview(main_frame, columns=columns, show="headings")
         self.treeview.grid(row=6, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Configure treeview columns
@@ -95,12 +145,27 @@ class DictionaryApp:
         self.treeview.column("Term", width=150)
         self.treeview.column("Definition", width=250)
         self.treeview.column("Labels", width=150)
+        if self._federation is not None:
+            self.treeview.heading("Source", text="Source")
+            self.treeview.column("Source", width=100)
 
         # Add scrollbar
         scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.treeview.yview)
         scrollbar.grid(row=6, column=2, sticky=(tk.N, tk.S))
         self.treeview.configure(yscrollcommand=scrollbar.set)
 
+        # Related terms panel, refreshed whenever a term is selected
+        related_frame = ttk.LabelFrame(main_frame, text="Related Terms", padding="5")
+        related_frame.grid(row=6, column=3, sticky=(tk.N, tk.S), padx=(10, 0))
+        self.related_treeview = ttk.Treeview(related_frame, columns=("Term", "Similarity"), show="headings")
+        self.related_treeview.grid(row=0, column=0, sticky=(tk.N, tk.S))
+        self.related_treeview.heading("Term", text="Term")
+        self.related_treeview.heading("Similarity", text="Similarity")
+        self.related_treeview.column("Term", width=150)
+        self.related_treeview.column("Similarity", width=70)
+        self.treeview.bind('<<TreeviewSelect>>', self.show_related_terms)
+        self.related_treeview.bind('<Double-1>', self._on_related_double_click)
+
         # Configure window close handler
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
@@ -119,23 +184,122 @@ class DictionaryApp:
             
             self.term_entry.delete(0, tk.END)
             self.definition_entry.delete(0, tk.END)
-            self.populate_treeview()
         else:
             messagebox.showerror("Error", "Term and Definition fields cannot be empty!")
     
     def populate_treeview(self) -> None:
         """Update the treeview with current dictionary contents."""
-        for i in self.treeview.get_children():
-            self.treeview.delete(i)
+        self._view_search = None
+        self._view_labels = []
+        self._clear_treeview()
         
         terms = self.dict_manager.get_all_terms()
         for term, term_data in terms.items():
-            labels_str = ", ".join(term_data.get("labels", []))
-            self.treeview.insert("", tk.END, values=(
-                term, 
-                term_data["definition"], 
-                labels_str
-            ))
+            self._insert_row(term, term_data)
+    
+    def _clear_treeview(self) -> None:
+        """Remove all rows from the treeview."""
+        for i in self.treeview.get_children():
+            self.treeview.delete(i)
+        self._term_items.clear()
+        self._mounted_items.clear()
+    
+    def _row_values(self, term: str, term_data: Dict[str, Any], source: Optional[str] = None) -> Tuple[str, ...]:
+        """Get the treeview values for a term.
+        
+        Args:
+            term: The term to display.
+            term_data: The term's definition and labels.
+            source: Name of the mounted dictionary the term is from, or None
+                for the data file. Only shown when dictionaries are mounted.
+        
+        Returns:
+            Tuple[str, ...]: The term, definition and labels, plus the
+            source when dictionaries are mounted.
+        """
+        values = (term, term_data["definition"], ", ".join(term_data.get("labels", [])))
+        if self._federation is not None:
+            values += (source or self._filename,)
+        return values
+    
+    def _insert_row(self, term: str, term_data: Dict[str, Any]) -> None:
+        """Append a row for a term to the treeview.
+        
+        Args:
+            term: The term to display.
+            term_data: The term's definition and labels.
+        """
+        self._term_items[term] = self.treeview.insert("", tk.END, values=self._row_values(term, term_data))
+    
+    def _insert_mounted_rows(self, results: List[FederatedResult]) -> None:
+        """Append rows for terms found in mounted dictionaries.
+        
+        Args:
+            results: (source, term, term data) matches from the mounted dictionaries.
+        """
+        for source, term, term_data in results:
+            item = self.treeview.insert("", tk.END, values=self._row_values(term, term_data, source))
+            self._mounted_items[item] = source
+    
+    def _is_read_only(self, item: str) -> bool:
+        """Check whether a row is from a mounted dictionary, and say so if it is.
+        
+        Args:
+            item: The selected treeview item.
+        
+        Returns:
+            bool: True if the row cannot be changed.
+        """
+        if item in self._mounted_items:
+            messagebox.showerror("Error", f"Terms from '{self._mounted_items[item]}' are read-only!")
+            return True
+        return False
+    
+    def _matches_view(self, term: str, term_data: Dict[str, Any]) -> bool:
+        """Check whether a term passes the active search or label filter.
+        
+        Args:
+            term: The term to check.
+            term_data: The term's definition and labels.
+        
+        Returns:
+            bool: True if the term should be displayed.
+        """
+        if self._view_search is not None and not self.dict_manager.matches_search(term, self._view_search):
+            return False
+        if self._view_labels:
+            term_labels = term_data.get("labels", [])
+            return any(label in term_labels for label in self._view_labels)
+        return True
+    
+    def _on_dictionary_changed(self, events: List[ChangeEvent]) -> None:
+        """Apply a batch of dictionary changes to the treeview and label filters.
+        
+        Args:
+            events: The coalesced changes since the last batch.
+        """
+        for event in events:
+            item = self._term_items.pop(event.term, None)
+            if event.kind is ChangeKind.TERM_REMOVED:
+                if item is not None:
+                    self.treeview.delete(item)
+                continue
+            
+            term_data = {
+                "definition": self.dict_manager.get_term_definition(event.term),
+                "labels": self.dict_manager.get_term_labels(event.term)
+            }
+            if not self._matches_view(event.term, term_data):
+                if item is not None:
+                    self.treeview.delete(item)
+            elif item is None:
+                self._insert_row(event.term, term_data)
+            else:
+                self.treeview.item(item, values=self._row_values(event.term, term_data))
+                self._term_items[event.term] = item
+        
+        if set(self.label_vars) != self.dict_manager.get_all_labels():
+            self.update_label_filters()
     
     def remove_term(self) -> None:
         """Handle removing a selected term."""
@@ -145,15 +309,45 @@ class DictionaryApp:
             return
         
         selected_item = selected_items[0]
+        if self._is_read_only(selected_item):
+            return
         term = self.treeview.item(selected_item)['values'][0]
         
         if messagebox.askyesno("Confirm", f"Are you sure you want to remove '{term}'?"):
             self.dict_manager.remove_term(term)
-            self.populate_treeview()
+    
+    def _autosave(self) -> None:
+        """Save unsaved changes in the background and schedule the next autosave.
+        
+        A failure of the previous background save is reported once, until a
+        save succeeds again.
+        """
+        error = self.dict_manager.last_save_error
+        if error is None:
+            self._save_error_reported = False
+        elif not self._save_error_reported:
+            self._save_error_reported = True
+            messagebox.showwarning(
+                "Autosave Failed",
+                f"Your changes could not be saved: {error}\nSaving will be retried automatically."
+            )
+        self.dict_manager.save_in_background()
+        self._autosave_job = self.root.after(AUTOSAVE_INTERVAL_MS, self._autosave)
     
     def on_closing(self) -> None:
-        """Handle application closing."""
+        """Handle application closing.
+        
+        Waits for an in-flight background save and writes any changes made
+        since, so closing is quick when nothing is left to save.
+        """
+        self.root.after_cancel(self._autosave_job)
+        if self._related_job is not None:
+            self.root.after_cancel(self._related_job)
+        if self._related_future is not None:
+            self._related_future.cancel()
         self.dict_manager.save_data()
+        if self._federation is not None:
+            self._federation.close()
         self.root.destroy() 
     
     def search_terms(self, event: Optional[tk.Event] = None) -> None:
@@ -162,22 +356,19 @@ class DictionaryApp:
         Args:
             event: Optional keyboard event that triggered the search.
         """
-        search_text = self.search_entry.get().lower()
+        search_text = self.search_entry.get()
+        self._view_search = search_text
+        self._view_labels = []
         
         # Clear current treeview
-        for item in self.treeview.get_children():
-            self.treeview.delete(item)
+        self._clear_treeview()
         
         # Populate with filtered results
-        terms = self.dict_manager.get_all_terms()
+        terms = self.dict_manager.search_terms(search_text)
         for term, term_data in terms.items():
-            if search_text in term.lower():
-                labels_str = ", ".join(term_data.get("labels", []))
-                self.treeview.insert("", tk.END, values=(
-                    term, 
-                    term_data["definition"],
-                    labels_str
-                ))
+            self._insert_row(term, term_data)
+        if self._federation is not None and search_text:
+            self._insert_mounted_rows(self._federation.search_terms(search_text))
     
     def edit_term(self) -> None:
         """Handle editing the selected term."""
@@ -187,8 +378,10 @@ class DictionaryApp:
             return
         
         selected_item = selected_items[0]
+        if self._is_read_only(selected_item):
+            return
         values = self.treeview.item(selected_item)['values']
-        term, definition, labels = values
+        term, definition, labels = values[:3]
         
         # Convert labels string back to list
         labels_list = [label.strip() for label in labels.split(',')] if labels else []
@@ -202,9 +395,134 @@ class DictionaryApp:
         # Store the labels temporarily
         self.current_labels = labels_list
         
-        # Remove old term and update UI
+        # Remove old term; the treeview updates from the change event
         self.dict_manager.remove_term(term)
-        self.populate_treeview()
+
+    def show_related_terms(self, event: Optional[tk.Event] = None) -> None:
+        """Show the terms most related to the selected term in the related terms panel.
+        
+        The first time, the similarity index is built in the background and
+        the panel shows a placeholder until it is ready. Queries run in the
+        background too, and the panel is filled when the results arrive.
+        
+        Args:
+            event: Optional selection event that triggered the update.
+        """
+        if self._related_job is not None:
+            self.root.after_cancel(self._related_job)
+            self._related_job = None
+        if self._related_future is not None:
+            self._related_future.cancel()
+            self._related_future = None
+        for item in self.related_treeview.get_children():
+            self.related_treeview.delete(item)
+        
+        selected_items = self.treeview.selection()
+        # Related terms are only found within the data file
+        if not selected_items or selected_items[0] in self._mounted_items:
+            return
+        
+        if not self.dict_manager.related_terms_ready:
+            self.dict_manager.prepare_related_terms()
+            self.related_treeview.insert("", tk.END, values=("Loading...", ""))
+            self._related_job = self.root.after(RELATED_TERMS_POLL_MS, self.show_related_terms)
+            return
+        
+        term = str(self.treeview.item(selected_items[0])['values'][0])
+        self._related_future = self.dict_manager.request_related_terms(term, RELATED_TERMS_COUNT)
+        self._show_related_results()
+    
+    def _show_related_results(self) -> None:
+        """Fill the related terms panel once the pending query has finished."""
+        future = self._related_future
+        if not future.done():
+            self._related_job = self.root.after(RELATED_TERMS_RESULT_POLL_MS, self._show_related_results)
+            return
+        self._related_job = None
+        self._related_future = None
+        for related, score in future.result():
+            self.related_treeview.insert("", tk.END, values=(related, f"{score:.2f}"))
+    
+    def _on_related_double_click(self, event: tk.Event) -> None:
+        """Select a related term in the main treeview when it is double-clicked.
+        
+        Args:
+            event: The double-click event object.
+        """
+        item = self.related_treeview.identify('item', event.x, event.y)
+        if not item:
+            return
+        term = str(self.related_treeview.item(item)['values'][0])
+        term_item = self._term_items.get(term)
+        if term_item is not None:
+            self.treeview.selection_set(term_item)
+            self.treeview.see(term_item)
+    
+    def show_duplicates(self) -> None:
+        """Show terms with near-duplicate definitions in a report window."""
+        clusters = self.dict_manager.find_duplicates()
+        if not clusters:
+            messagebox.showinfo("Duplicates", "No near-duplicate definitions found.")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Near-Duplicate Definitions")
+        report = ttk.Treeview(window, columns=("Cluster", "Term", "Definition"), show="headings")
+        report.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        report.heading("Cluster", text="Cluster")
+        report.heading("Term", text="Term")
+        report.heading("Definition", text="Definition")
+        report.column("Cluster", width=60)
+        report.column("Term", width=150)
+        report.column("Definition", width=350)
+        
+        for number, cluster in enumerate(clusters, 1):
+            for term in cluster:
+                report.insert("", tk.END, values=(
+                    number,
+                    term,
+                    self.dict_manager.get_term_definition(term)
+                ))
+        
+        scrollbar = ttk.Scrollbar(window, orient=tk.VERTICAL, command=report.yview)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        report.configure(yscrollcommand=scrollbar.set)
+
+    def show_history(self) -> None:
+        """Show the earlier definitions of the selected term in a history window."""
+        selected_items = self.treeview.selection()
+        if not selected_items:
+            messagebox.showerror("Error", "Please select a term to view its history!")
+            return
+        
+        selected_item = selected_items[0]
+        term = str(self.treeview.item(selected_item)['values'][0])
+        manager = self.dict_manager
+        if selected_item in self._mounted_items:
+            manager = self._federation.get(self._mounted_items[selected_item])
+        revisions = manager.get_history(term)
+        if not revisions:
+            messagebox.showinfo("History", f"'{term}' has no earlier definitions.")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title(f"History of '{term}'")
+        report = ttk.Treeview(window, columns=("Replaced", "Definition"), show="headings")
+        report.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        report.heading("Replaced", text="Replaced")
+        report.heading("Definition", text="Definition")
+        report.column("Replaced", width=140)
+        report.column("Definition", width=400)
+        
+        for replaced, definition in revisions:
+            report.insert("", tk.END, values=(
+                datetime.fromtimestamp(replaced).strftime("%Y-%m-%d %H:%M"),
+                definition
+            ))
+        
+        scrollbar = ttk.Scrollbar(window, orient=tk.VERTICAL, command=report.yview)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        report.configure(yscrollcommand=scrollbar.set)
 
     def on_double_click(self, event: tk.Event) -> None:
         """Handle double-click event on treeview item."""
@@ -231,7 +549,9 @@ class DictionaryApp:
             self.search_entry.insert(0, "Search terms...") 
 
     def update_label_filters(self) -> None:
-        """Update the label filter checkboxes."""
+        """Update the label filter checkboxes, keeping labels that stay checked."""
+        checked = {label for label, (var, _) in self.label_vars.items() if var.get()}
+        
         # Clear existing checkboxes
         for var, widget in self.label_vars.values():
             widget.grid_forget()
@@ -241,7 +561,7 @@ class DictionaryApp:
         row = 0
         col = 0
         for label in sorted(self.dict_manager.get_all_labels()):
-            var = tk.BooleanVar()
+            var = tk.BooleanVar(value=label in checked)
             cb = ttk.Checkbutton(
                 self.filter_frame, 
                 text=label, 
@@ -268,11 +588,11 @@ class DictionaryApp:
             return
 
         selected_item = selected_items[0]
+        if self._is_read_only(selected_item):
+            return
         term = self.treeview.item(selected_item)['values'][0]
         self.dict_manager.add_label_to_term(term, label)
         self.label_entry.delete(0, tk.END)
-        self.update_label_filters()
-        self.populate_treeview()
 
     def apply_filters(self) -> None:
         """Apply label filters to the treeview."""
@@ -280,19 +600,17 @@ class DictionaryApp:
             label for label, (var, _) in self.label_vars.items() 
             if var.get()
         ]
+        self._view_search = None
+        self._view_labels = selected_labels
         
         # Clear current treeview
-        for item in self.treeview.get_children():
-            self.treeview.delete(item)
+        self._clear_treeview()
         
         # Get filtered terms
         filtered_terms = self.dict_manager.get_terms_by_labels(selected_labels)
         
         # Populate treeview with filtered results
         for term, term_data in filtered_terms.items():
-            labels_str = ", ".join(term_data.get("labels", []))
-            self.treeview.insert("", tk.END, values=(
-                term, 
-                term_data["definition"], 
-                labels_str
-            )) 
\ No newline at end of file
+            self._insert_row(term, term_data)
+        if self._federation is not None and selected_labels:
+            self._insert_mounted_rows(self._federation.get_terms_by_labels(selected_labels))
\ No newline at end of file
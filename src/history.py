@@ -0,0 +1,337 @@
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+from difflib import SequenceMatcher
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from .data_manager import atomic_open
+
+# Bump when the history bucket files change shape
+HISTORY_VERSION = 1
+
+# Every this many revisions of a term is stored in full, so rebuilding any
+# revision applies fewer deltas than this
+KEYFRAME_INTERVAL = 8
+
+# Number of files the history is spread over; at most 256, one hash byte
+BUCKET_COUNT = 256
+
+# Definitions with more words than this are stored in full, since comparing
+# texts costs time growing with the square of their length
+MAX_DELTA_WORDS = 5000
+
+# Splits a text before each word that follows whitespace
+_TOKEN_BOUNDARY = re.compile(r'(?<=\s)(?=\S)')
+
+# A delta is a list of [start, end] ranges copied from the base text and
+# strings inserted between them
+Delta = List[Union[List[int], str]]
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split a text into words, each with the whitespace that follows it.
+
+    Args:
+        text: The text to split.
+
+    Returns:
+        List[str]: Tokens that join back into the text.
+    """
+    return [token for token in _TOKEN_BOUNDARY.split(text) if token]
+
+
+def make_delta(base: str, target: str) -> Optional[Delta]:
+    """Encode a text as the changes that turn another text into it.
+
+    The texts are compared word by word rather than character by character,
+    which keeps comparing long definitions fast.
+
+    Args:
+        base: The text the delta is applied to.
+        target: The text the delta produces.
+
+    Returns:
+        Optional[Delta]: Copied ranges of base and inserted strings, in
+        order, or None if either text has more than MAX_DELTA_WORDS words.
+    """
+    base_tokens = _tokenize(base)
+    target_tokens = _tokenize(target)
+    if max(len(base_tokens), len(target_tokens)) > MAX_DELTA_WORDS:
+        return None
+    # Character offset of each base token, for the copied ranges
+    offsets = [0]
+    for token in base_tokens:
+        offsets.append(offsets[-1] + len(token))
+
+    delta: Delta = []
+    matcher = SequenceMatcher(None, base_tokens, target_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([offsets[i1], offsets[i2]])
+        elif tag != 'delete':
+            inserted = ''.join(target_tokens[j1:j2])
+            if delta and isinstance(delta[-1], str):
+                delta[-1] += inserted
+            else:
+                delta.append(inserted)
+    return delta
+
+
+def apply_delta(base: str, delta: Delta) -> str:
+    """Rebuild a text from its base and a delta made by make_delta.
+
+    Args:
+        base: The text the delta was made against.
+        delta: The delta to apply.
+
+    Returns:
+        str: The rebuilt text.
+    """
+    return ''.join(op if isinstance(op, str) else base[op[0]:op[1]] for op in delta)
+
+
+class RevisionHistory:
+    """Keeps earlier definitions of terms in files next to the data file.
+
+    Revisions are reverse deltas: each is stored as the changes from the
+    definition that replaced it, and the newest from the term's current
+    definition. Every KEYFRAME_INTERVAL-th revision of a term, the last
+    definition of a removed term, revisions too long to compare, and any
+    revision a delta would not shrink are stored in full instead.
+
+    Terms are spread over BUCKET_COUNT files in a directory by a hash of
+    the term. Viewing a term's history reads only its bucket, and saving
+    rewrites only the buckets of terms with new revisions, so neither cost
+    grows with the whole history. Nothing is read when a dictionary opens.
+
+    New revisions are buffered with the change generation they were made
+    in, and save() writes only those a saved snapshot of the dictionary
+    covers, since each delta needs the definition that replaced it on disk.
+    """
+
+    def __init__(self, directory: str, keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+        """Initialize the history without reading any files.
+
+        Args:
+            directory: Path of the directory holding the bucket files.
+            keyframe_interval: Store every this many revisions in full.
+        """
+        self.directory = directory
+        self.keyframe_interval = keyframe_interval
+        # Revisions recorded but not yet saved, oldest first, with their text
+        # and the definition that replaced it; deltas are made when saving
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        # Terms whose newest pending revision is their definition at removal
+        self._removed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def record_change(self, term: str, old_definition: str, new_definition: str, generation: int = 0) -> None:
+        """Record that a term's definition was replaced.
+
+        Args:
+            term: The term that changed.
+            old_definition: The definition being replaced.
+            new_definition: The definition replacing it.
+            generation: The dictionary's change count when the change was made.
+        """
+        if old_definition == new_definition:
+            return
+        with self._lock:
+            self._pending.setdefault(term, []).append({
+                "time": time.time(),
+                "text": old_definition,
+                "replaced_by": new_definition,
+                "generation": generation
+            })
+
+    def record_removal(self, term: str, definition: str, generation: int = 0) -> None:
+        """Record the definition of a term being removed.
+
+        With no current definition to make a delta against, it is kept in
+        full unless the term is added again before it is saved.
+
+        Args:
+            term: The term being removed.
+            definition: Its definition.
+            generation: The dictionary's change count when it was removed.
+        """
+        with self._lock:
+            self._pending.setdefault(term, []).append({
+                "time": time.time(),
+                "text": definition,
+                "replaced_by": None,
+                "generation": generation
+            })
+            self._removed.add(term)
+
+    def record_addition(self, term: str, definition: str, generation: int = 0) -> None:
+        """Record that a term was added.
+
+        If the term was removed since the last save, as editing does, its
+        definition at removal becomes a delta against the new definition, or
+        is dropped when the definition did not change.
+
+        Args:
+            term: The term being added.
+            definition: Its definition.
+            generation: The dictionary's change count when it was added.
+        """
+        with self._lock:
+            if term not in self._removed:
+                return
+            self._removed.discard(term)
+            revisions = self._pending[term]
+            revision = revisions[-1]
+            if revision["text"] == definition:
+                revisions.pop()
+                if not revisions:
+                    del self._pending[term]
+            else:
+                # The delta needs the new definition, so it is only valid
+                # in snapshots that include the addition
+                revision["replaced_by"] = definition
+                revision["generation"] = generation
+
+    def get_revisions(self, term: str, current: Optional[str]) -> List[Tuple[float, str]]:
+        """Get the earlier definitions of a term, reading only its bucket file.
+
+        Args:
+            term: The term to look up.
+            current: The term's current definition, or None if it does not exist.
+
+        Returns:
+            List[Tuple[float, str]]: (time replaced, definition) pairs,
+            newest first.
+        """
+        saved = self._read_bucket(self._bucket_path(term)).get(term, [])
+        with self._lock:
+            revisions = saved + self._pending.get(term, [])
+
+        history: List[Tuple[float, str]] = []
+        text = current or ''
+        for revision in reversed(revisions):
+            # Keyframes and unsaved revisions carry their full text
+            if "text" in revision:
+                text = revision["text"]
+            else:
+                text = apply_delta(text, revision["delta"])
+            history.append((revision["time"], text))
+        return history
+
+    def save(self, generation: Optional[int] = None) -> None:
+        """Write buffered revisions to the bucket files of their terms.
+
+        Args:
+            generation: Change count of the dictionary snapshot just saved;
+                only revisions it covers are written. None writes them all.
+        """
+        with self._save_lock:
+            flushed = self._take_pending(generation)
+            if not flushed:
+                return
+            buckets: Dict[str, List[str]] = {}
+            for term in flushed:
+                buckets.setdefault(self._bucket_path(term), []).append(term)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                for path, terms in buckets.items():
+                    bucket = self._read_bucket(path)
+                    for term in terms:
+                        revisions = bucket.setdefault(term, [])
+                        for revision in flushed[term]:
+                            revisions.append(self._stored_form(revision, len(revisions)))
+                    content = json.dumps({"version": HISTORY_VERSION, "terms": bucket},
+                                         ensure_ascii=False, separators=(',', ':'))
+                    with atomic_open(path, 'w', encoding='utf-8') as f:
+                        f.write(content)
+                    # Written revisions must not be written again if a later bucket fails
+                    for term in terms:
+                        del flushed[term]
+            except BaseException:
+                with self._lock:
+                    for term, revisions in flushed.items():
+                        self._pending[term] = revisions + self._pending.get(term, [])
+                raise
+
+    def _take_pending(self, generation: Optional[int]) -> Dict[str, List[Dict[str, Any]]]:
+        """Remove and return the buffered revisions a snapshot covers.
+
+        Args:
+            generation: Change count of the saved snapshot, or None for all.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Covered revisions per term, oldest first.
+        """
+        taken: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for term, revisions in list(self._pending.items()):
+                count = len(revisions)
+                if generation is not None:
+                    count = sum(1 for revision in revisions if revision["generation"] <= generation)
+                if not count:
+                    continue
+                taken[term] = revisions[:count]
+                if count < len(revisions):
+                    self._pending[term] = revisions[count:]
+                else:
+                    del self._pending[term]
+                    # A saved removal stays in full even if the term returns
+                    self._removed.discard(term)
+        return taken
+
+    def _stored_form(self, revision: Dict[str, Any], position: int) -> Dict[str, Any]:
+        """Choose between the full text and a delta of a revision for storage.
+
+        The delta is made here, on the saving thread, since comparing long
+        definitions is too slow to do while editing.
+
+        Args:
+            revision: A pending revision with its text and the definition
+                that replaced it, if any.
+            position: Index the revision will have among the term's revisions.
+
+        Returns:
+            Dict[str, Any]: The revision as written to the file.
+        """
+        full = {"time": revision["time"], "text": revision["text"]}
+        if revision["replaced_by"] is None or (position + 1) % self.keyframe_interval == 0:
+            return full
+        delta = make_delta(revision["replaced_by"], revision["text"])
+        if delta is None or len(json.dumps(delta, ensure_ascii=False)) >= len(revision["text"]):
+            return full
+        return {"time": revision["time"], "delta": delta}
+
+    def _bucket_path(self, term: str) -> str:
+        """Get the path of the bucket file that holds a term.
+
+        Args:
+            term: The term.
+
+        Returns:
+            str: Path of its bucket file, chosen by a stable hash of the term.
+        """
+        bucket = hashlib.sha1(term.encode('utf-8')).digest()[0] % BUCKET_COUNT
+        return os.path.join(self.directory, f"{bucket:02x}.json")
+
+    @staticmethod
+    def _read_bucket(path: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Read the revisions from a bucket file.
+
+        Args:
+            path: Path of the bucket file.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Revisions per term, or none if
+            the file is missing, unreadable or from another version.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != HISTORY_VERSION:
+            return {}
+        return data["terms"]
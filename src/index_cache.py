@@ -0,0 +1,170 @@
+from typing import Dict, Any, List, Optional, Set
+from array import array
+import gc
+import json
+import os
+import sys
+from .data_manager import atomic_open
+from .search_index import SearchIndex
+
+# Bump when SearchIndex or the cache layout changes so stale caches are rebuilt
+CACHE_VERSION = 2
+
+# Dictionaries smaller than this index faster than a cache round trip
+CACHE_THRESHOLD = 5000
+
+# Array type code of an unsigned 32-bit integer, used for stored term numbers
+_POSTING_TYPE = 'I' if array('I').itemsize == 4 else 'L'
+
+
+def encode_index(index: SearchIndex) -> bytes:
+    """Serialize an index without pickle.
+
+    The terms are numbered, and a JSON line lists the terms, their
+    normalized keys (null when the term is already normalized) and each
+    token and label with its posting count. The postings follow as one
+    array of little-endian 32-bit term numbers, which loads far faster
+    than the same numbers parsed from JSON.
+
+    Args:
+        index: The index to serialize.
+
+    Returns:
+        bytes: The serialized index.
+    """
+    terms = list(index.keys.items())
+    numbers = {term: number for number, (term, _) in enumerate(terms)}
+    postings = array(_POSTING_TYPE)
+    counts: Dict[str, List[List[Any]]] = {"words": [], "labels": []}
+    for name, mapping in (("words", index.words), ("labels", index.labels)):
+        for key, found in list(mapping.items()):
+            postings.extend(map(numbers.__getitem__, found))
+            counts[name].append([key, len(found)])
+    if sys.byteorder == 'big':
+        postings.byteswap()
+    meta = {
+        "terms": [term for term, _ in terms],
+        "keys": [None if key == term else key for term, key in terms],
+        **counts,
+    }
+    return json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n' + postings.tobytes()
+
+
+def decode_index(content: bytes) -> SearchIndex:
+    """Rebuild an index serialized by encode_index.
+
+    Args:
+        content: The serialized index.
+
+    Returns:
+        SearchIndex: The rebuilt index.
+
+    Raises:
+        ValueError: If the content is not a valid serialized index.
+    """
+    meta_end = content.find(b'\n')
+    if meta_end < 0:
+        raise ValueError("Invalid index cache: missing postings")
+    postings = array(_POSTING_TYPE)
+    postings.frombytes(content[meta_end + 1:])
+    if sys.byteorder == 'big':
+        postings.byteswap()
+    # The index is millions of small sets; collecting cycles while creating
+    # them would cost more than the decoding itself
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        meta = json.loads(content[:meta_end])
+        terms, keys = meta["terms"], meta["keys"]
+        if len(terms) != len(keys):
+            raise ValueError("Invalid index cache: terms and keys differ in length")
+        term_at = terms.__getitem__
+        index = SearchIndex()
+        index.keys = {term: term if key is None else key for term, key in zip(terms, keys)}
+        position = 0
+        for name in ("words", "labels"):
+            mapping: Dict[str, Set[str]] = {}
+            for key, count in meta[name]:
+                mapping[key] = set(map(term_at, postings[position:position + count]))
+                position += count
+            setattr(index, name, mapping)
+        if position != len(postings):
+            raise ValueError("Invalid index cache: posting counts do not match")
+    except (KeyError, TypeError, IndexError, AttributeError) as e:
+        raise ValueError(f"Invalid index cache: {e}") from e
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return index
+
+
+class IndexCache:
+    """Persists a built SearchIndex next to the data file it was built from.
+
+    The cache file starts with a one-line JSON header holding the cache
+    version and the data file's fingerprint, followed by the index as
+    serialized by encode_index.
+    A cache is only used when its fingerprint matches the data file exactly.
+    JSON and a plain number array are used rather than pickle because the data directory may be
+    shared, and loading the cache must never run code from the file.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        """Initialize the cache.
+
+        Args:
+            filepath: Path of the cache file.
+        """
+        self.filepath = filepath
+
+    def load(self, fingerprint: Optional[Dict[str, Any]]) -> Optional[SearchIndex]:
+        """Load the cached index if it was built from the given data file version.
+
+        The header is checked first, and the index itself is then read in a
+        single bulk read.
+
+        Args:
+            fingerprint: Fingerprint of the data file as currently loaded.
+
+        Returns:
+            Optional[SearchIndex]: The cached index, or None if the cache is
+            missing, stale or unreadable.
+        """
+        if fingerprint is None:
+            return None
+        try:
+            with open(self.filepath, 'rb') as f:
+                header = json.loads(f.readline())
+                if header != {"version": CACHE_VERSION, "fingerprint": fingerprint}:
+                    return None
+                return decode_index(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def remove_partial_write(self) -> None:
+        """Remove the temporary file of a write abandoned when a process exited."""
+        try:
+            os.remove(self.filepath + '.tmp')
+        except OSError:
+            pass
+
+    def save(self, index: SearchIndex, fingerprint: Dict[str, Any]) -> None:
+        """Write an index to the cache.
+
+        Args:
+            index: The index to persist. It must not be modified during the call.
+            fingerprint: Fingerprint of the data file the index reflects.
+        """
+        self.write(encode_index(index), fingerprint)
+
+    def write(self, content: bytes, fingerprint: Dict[str, Any]) -> None:
+        """Write an index already serialized by encode_index to the cache.
+
+        Args:
+            content: The serialized index.
+            fingerprint: Fingerprint of the data file the index reflects.
+        """
+        header = json.dumps({"version": CACHE_VERSION, "fingerprint": fingerprint})
+        with atomic_open(self.filepath, 'wb') as f:
+            f.write(header.encode('utf-8') + b'\n')
+            f.write(content)
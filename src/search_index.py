@@ -0,0 +1,288 @@
+from typing import Dict, List, Set, Iterable, Tuple, Optional, Any
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import re
+from .utils import normalize_key
+
+# Below this many terms the cost of starting worker processes and pickling
+# the chunks outweighs the tokenizing work itself.
+PARALLEL_THRESHOLD = 20000
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into the set of normalized word tokens used by the index.
+
+    Args:
+        text: The text to tokenize.
+
+    Returns:
+        Set[str]: Unique word tokens found in the text.
+    """
+    return set(_WORD_RE.findall(normalize_key(text)))
+
+
+class SearchIndex:
+    """Inverted indexes over dictionary terms, definitions and labels.
+
+    Word tokens from each term and its definition map to the set of terms
+    containing them, and each label maps to the set of terms carrying it.
+    Each term's normalized key is computed once here so searches never
+    normalize the stored terms again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.keys: Dict[str, str] = {}
+        self.words: Dict[str, Set[str]] = {}
+        self.labels: Dict[str, Set[str]] = {}
+
+    def add(self, term: str, term_data: Dict[str, Any]) -> None:
+        """Index a term and its data.
+
+        Args:
+            term: The term to index.
+            term_data: The term's definition and labels.
+        """
+        key = normalize_key(term)
+        # Share the term string itself when it is already normalized
+        self.keys[term] = term if key == term else key
+        tokens = tokenize(term) | tokenize(term_data.get("definition", ""))
+        for token in tokens:
+            self.words.setdefault(token, set()).add(term)
+        for label in term_data.get("labels", []):
+            self.labels.setdefault(label, set()).add(term)
+
+    def remove(self, term: str, term_data: Dict[str, Any]) -> None:
+        """Remove a previously indexed term.
+
+        Args:
+            term: The term to remove.
+            term_data: The data the term was indexed with.
+        """
+        self.keys.pop(term, None)
+        tokens = tokenize(term) | tokenize(term_data.get("definition", ""))
+        for token in tokens:
+            self._discard(self.words, token, term)
+        for label in term_data.get("labels", []):
+            self._discard(self.labels, label, term)
+
+    def add_label(self, term: str, label: str) -> None:
+        """Record that a term carries a label.
+
+        Args:
+            term: The labelled term.
+            label: The label.
+        """
+        self.labels.setdefault(label, set()).add(term)
+
+    def remove_label(self, term: str, label: str) -> None:
+        """Record that a term no longer carries a label.
+
+        Args:
+            term: The term the label was removed from.
+            label: The label.
+        """
+        self._discard(self.labels, label, term)
+
+    def merge(self, other: 'SearchIndex') -> None:
+        """Merge another index into this one.
+
+        Args:
+            other: The index whose postings are added to this one.
+        """
+        self.keys.update(other.keys)
+        for target, source in ((self.words, other.words), (self.labels, other.labels)):
+            for key, terms in source.items():
+                existing = target.get(key)
+                if existing is None:
+                    target[key] = terms
+                else:
+                    existing.update(terms)
+
+    def find_substring(self, text: str) -> Set[str]:
+        """Find terms whose normalized key contains the normalized text.
+
+        Args:
+            text: The text to look for within terms.
+
+        Returns:
+            Set[str]: Terms matching the text.
+        """
+        needle = normalize_key(text)
+        return {term for term, key in self.keys.items() if needle in key}
+
+    def matches_substring(self, term: str, text: str) -> bool:
+        """Check whether an indexed term's normalized key contains the text.
+
+        Args:
+            term: The term to check.
+            text: The text to look for within the term.
+
+        Returns:
+            bool: True if the term is indexed and matches.
+        """
+        key = self.keys.get(term)
+        return key is not None and normalize_key(text) in key
+
+    def find_words(self, text: str) -> Set[str]:
+        """Find terms whose term or definition contains every word in the text.
+
+        Args:
+            text: The words to look up.
+
+        Returns:
+            Set[str]: Terms containing all of the words.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return set()
+        postings = sorted((self.words.get(token, set()) for token in tokens), key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def find_labels(self, labels: Iterable[str]) -> Set[str]:
+        """Find terms carrying any of the given labels.
+
+        Args:
+            labels: The labels to look up.
+
+        Returns:
+            Set[str]: Terms carrying at least one of the labels.
+        """
+        found: Set[str] = set()
+        for label in labels:
+            found.update(self.labels.get(label, ()))
+        return found
+
+    def all_labels(self) -> Set[str]:
+        """Get every label carried by at least one term.
+
+        Returns:
+            Set[str]: The indexed labels.
+        """
+        return set(self.labels)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], key: str, term: str) -> None:
+        """Remove a term from a posting set, dropping the set once empty."""
+        terms = postings.get(key)
+        if terms is not None:
+            terms.discard(term)
+            if not terms:
+                del postings[key]
+
+
+class ScanIndex:
+    """Answers SearchIndex queries by scanning the dictionary directly.
+
+    Used while the real index is being built, so that searches work from
+    the first moment at the cost of a full scan per query. Updates are
+    ignored because every query reads the live dictionary.
+    """
+
+    def __init__(self, dictionary: Dict[str, Dict[str, Any]]) -> None:
+        """Initialize the scanner.
+
+        Args:
+            dictionary: The live mapping of terms to their data.
+        """
+        self._dictionary = dictionary
+
+    def add(self, term: str, term_data: Dict[str, Any]) -> None:
+        """Ignore an added term; scans always see the live dictionary."""
+
+    def remove(self, term: str, term_data: Dict[str, Any]) -> None:
+        """Ignore a removed term; scans always see the live dictionary."""
+
+    def add_label(self, term: str, label: str) -> None:
+        """Ignore an added label; scans always see the live dictionary."""
+
+    def remove_label(self, term: str, label: str) -> None:
+        """Ignore a removed label; scans always see the live dictionary."""
+
+    def find_substring(self, text: str) -> Set[str]:
+        """Find terms whose normalized form contains the normalized text."""
+        needle = normalize_key(text)
+        return {term for term in self._dictionary if needle in normalize_key(term)}
+
+    def matches_substring(self, term: str, text: str) -> bool:
+        """Check whether a term's normalized form contains the text."""
+        return term in self._dictionary and normalize_key(text) in normalize_key(term)
+
+    def find_words(self, text: str) -> Set[str]:
+        """Find terms whose term or definition contains every word in the text."""
+        tokens = tokenize(text)
+        if not tokens:
+            return set()
+        return {
+            term for term, term_data in self._dictionary.items()
+            if tokens <= tokenize(term) | tokenize(term_data.get("definition", ""))
+        }
+
+    def find_labels(self, labels: Iterable[str]) -> Set[str]:
+        """Find terms carrying any of the given labels."""
+        wanted = set(labels)
+        return {
+            term for term, term_data in self._dictionary.items()
+            if wanted.intersection(term_data.get("labels", []))
+        }
+
+    def all_labels(self) -> Set[str]:
+        """Get every label carried by at least one term."""
+        labels: Set[str] = set()
+        for term_data in self._dictionary.values():
+            labels.update(term_data.get("labels", []))
+        return labels
+
+
+def _build_partial_index(items: List[Tuple[str, Dict[str, Any]]]) -> SearchIndex:
+    """Build an index over one chunk of dictionary items.
+
+    Module level so it can be pickled into worker processes.
+
+    Args:
+        items: (term, term_data) pairs to index.
+
+    Returns:
+        SearchIndex: Index covering only the given items.
+    """
+    index = SearchIndex()
+    for term, term_data in items:
+        index.add(term, term_data)
+    return index
+
+
+def build_index(dictionary: Dict[str, Dict[str, Any]],
+                workers: Optional[int] = None,
+                threshold: int = PARALLEL_THRESHOLD) -> SearchIndex:
+    """Build a search index over a dictionary, in parallel for large inputs.
+
+    The dictionary is split into chunks that are indexed in a process pool
+    and merged. Dictionaries smaller than the threshold, or a single worker,
+    are indexed in the calling process. Workers are spawned rather than
+    forked, since the caller is usually a background thread of a process
+    whose other threads a forked child could deadlock on.
+
+    Args:
+        dictionary: Mapping of terms to their data.
+        workers: Number of worker processes. Defaults to the CPU count.
+        threshold: Minimum number of terms before worker processes are used.
+
+    Returns:
+        SearchIndex: Index covering every term in the dictionary.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = list(dictionary.items())
+    if workers == 1 or len(items) < threshold:
+        return _build_partial_index(items)
+
+    # A few chunks per worker keeps the pool busy when chunks finish unevenly.
+    chunk_size = -(-len(items) // (workers * 4))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    index = SearchIndex()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        for partial in executor.map(_build_partial_index, chunks):
+            index.merge(partial)
+    return index
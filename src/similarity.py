@@ -0,0 +1,186 @@
+from typing import Dict, List, Tuple
+from collections import Counter
+import heapq
+import math
+import re
+import threading
+from .utils import normalize_key
+
+# Tokens in more than this share of documents carry little signal and would
+# make every query walk most of the postings, so queries skip them once the
+# collection has at least PRUNE_MIN_DOCUMENTS documents.
+MAX_DOCUMENT_FREQUENCY = 0.5
+PRUNE_MIN_DOCUMENTS = 20
+
+# Tokens in more documents than this are too common to walk while a query
+# waits; they only add to the scores of documents already found through
+# rarer tokens.
+MAX_WALKED_POSTINGS = 5000
+
+# Document norms are recomputed once the document count drifts this far
+# from the count they were computed with.
+NORM_REFRESH_DRIFT = 0.1
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def term_frequencies(text: str) -> Dict[str, int]:
+    """Count the normalized word tokens in a text.
+
+    Args:
+        text: The text to tokenize.
+
+    Returns:
+        Dict[str, int]: Occurrences of each token.
+    """
+    return Counter(_WORD_RE.findall(normalize_key(text)))
+
+
+class SimilarityEngine:
+    """Finds related documents by TF-IDF cosine similarity.
+
+    Documents are stored as a sparse term-document matrix: postings map each
+    token to the documents containing it and their term frequency. Scoring a
+    query multiplies its weight vector against the postings of its tokens
+    only (a sparse matrix-vector product), so the cost depends on the
+    documents that share tokens with the query rather than on every pair.
+
+    Document norms depend on inverse document frequencies that change as
+    documents are added or removed; they are cached and recomputed in bulk
+    once the collection size has drifted by NORM_REFRESH_DRIFT.
+
+    Queries may run on another thread than the one adding and removing
+    documents; a lock keeps them from seeing a half-applied change.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty engine."""
+        self._documents: Dict[str, Dict[str, int]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._norms: Dict[str, float] = {}
+        self._norm_document_count = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Get the number of indexed documents."""
+        return len(self._documents)
+
+    def build(self, documents: Dict[str, str]) -> None:
+        """Replace the indexed documents.
+
+        Args:
+            documents: Mapping of keys (e.g. terms) to their text.
+        """
+        with self._lock:
+            self._documents = {}
+            self._postings = {}
+            for key, text in documents.items():
+                self._add_counts(key, term_frequencies(text))
+            self._refresh_norms()
+
+    def add(self, key: str, text: str) -> None:
+        """Index a document, replacing any existing one with the same key.
+
+        Args:
+            key: The document's key.
+            text: The document's text.
+        """
+        counts = term_frequencies(text)
+        with self._lock:
+            self.remove(key)
+            self._add_counts(key, counts)
+            self._norms[key] = self._norm(counts)
+            self._refresh_norms_if_drifted()
+
+    def remove(self, key: str) -> None:
+        """Remove a document if it is indexed.
+
+        Args:
+            key: The document's key.
+        """
+        with self._lock:
+            counts = self._documents.pop(key, None)
+            if counts is None:
+                return
+            for token in counts:
+                documents = self._postings[token]
+                del documents[key]
+                if not documents:
+                    del self._postings[token]
+            self._norms.pop(key, None)
+            self._refresh_norms_if_drifted()
+
+    def most_similar(self, key: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Find the documents most similar to an indexed document.
+
+        Args:
+            key: The document to compare against.
+            k: Maximum number of results.
+
+        Returns:
+            List[Tuple[str, float]]: (key, cosine similarity) pairs, most
+            similar first, excluding the document itself and unrelated ones.
+        """
+        with self._lock:
+            return self._most_similar(key, k)
+
+    def _most_similar(self, key: str, k: int) -> List[Tuple[str, float]]:
+        """Find the most similar documents; the caller holds the lock."""
+        counts = self._documents.get(key)
+        if not counts:
+            return []
+        max_documents = len(self._documents)
+        if max_documents >= PRUNE_MIN_DOCUMENTS:
+            max_documents *= MAX_DOCUMENT_FREQUENCY
+        scores: Dict[str, float] = {}
+        # Rarest tokens first, so common ones find the candidates already scored
+        for token in sorted(counts, key=lambda token: len(self._postings[token])):
+            documents = self._postings[token]
+            if len(documents) > max_documents:
+                break
+            idf = self._idf(token)
+            query_weight = (1 + math.log(counts[token])) * idf * idf
+            if len(documents) <= MAX_WALKED_POSTINGS:
+                for other, other_count in documents.items():
+                    scores[other] = scores.get(other, 0.0) + query_weight * (1 + math.log(other_count))
+            else:
+                for other in scores:
+                    other_count = documents.get(other)
+                    if other_count:
+                        scores[other] += query_weight * (1 + math.log(other_count))
+        scores.pop(key, None)
+
+        query_norm = self._norms.get(key) or self._norm(counts)
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1] / (self._norms.get(item[0]) or 1.0))
+        # Norms cached before recent changes can push scores slightly past 1
+        return [(other, min(1.0, score / (query_norm * (self._norms.get(other) or 1.0)))) for other, score in top]
+
+    def _add_counts(self, key: str, counts: Dict[str, int]) -> None:
+        """Store a document's token counts and postings."""
+        self._documents[key] = counts
+        for token, count in counts.items():
+            self._postings.setdefault(token, {})[key] = count
+
+    def _idf(self, token: str) -> float:
+        """Get the smoothed inverse document frequency of a token."""
+        return math.log((1 + len(self._documents)) / (1 + len(self._postings.get(token, ())))) + 1
+
+    def _norm(self, counts: Dict[str, int]) -> float:
+        """Get the Euclidean norm of a document's TF-IDF vector."""
+        return math.sqrt(sum(((1 + math.log(count)) * self._idf(token)) ** 2 for token, count in counts.items())) or 1.0
+
+    def _refresh_norms(self) -> None:
+        """Recompute every document norm with the current frequencies."""
+        total = 1 + len(self._documents)
+        idf = {token: math.log(total / (1 + len(documents))) + 1 for token, documents in self._postings.items()}
+        self._norms = {
+            key: math.sqrt(sum(((1 + math.log(count)) * idf[token]) ** 2 for token, count in counts.items())) or 1.0
+            for key, counts in self._documents.items()
+        }
+        self._norm_document_count = len(self._documents)
+
+    def _refresh_norms_if_drifted(self) -> None:
+        """Recompute norms once the collection size has drifted far enough."""
+        drift = abs(len(self._documents) - self._norm_document_count)
+        if drift > NORM_REFRESH_DRIFT * max(self._norm_document_count, 10):
+            self._refresh_norms()
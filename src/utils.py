@@ -1,5 +1,7 @@
 import os
 import sys
+import unicodedata
+from typing import Any, Optional, Set
 
 def app_data_path(relative_path: str) -> str:
     """Get the path to the directory where the executable resides or data directory.
@@ -14,4 +16,57 @@ def app_data_path(relative_path: str) -> str:
         application_path = os.path.dirname(sys.executable)
     else:
         application_path = os.path.dirname(os.path.dirname(__file__))
-    return os.path.join(application_path, relative_path) 
\ No newline at end of file
+    return os.path.join(application_path, relative_path)
+
+
+def normalize_key(text: str) -> str:
+    """Normalize text for accent- and case-insensitive comparison.
+    
+    Applies NFKD decomposition, strips combining marks and case-folds, so
+    that "Café" and "cafe" share a key and "Straße" matches "strasse".
+    
+    Args:
+        text: The text to normalize.
+    
+    Returns:
+        str: The normalized comparison key.
+    """
+    if text.isascii():
+        # Nothing to decompose, and casefold() equals lower() for ASCII
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return stripped.casefold()
+
+
+def deep_getsizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Get the size in bytes of an object and everything it references.
+    
+    Objects already in ``seen`` are not counted again, so sharing one set
+    across calls attributes each shared object to the first caller.
+    
+    Args:
+        obj: The object to measure.
+        seen: Ids of objects that have already been counted.
+    
+    Returns:
+        int: Total size in bytes of the object and its contents.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, '__dict__'):
+            stack.append(vars(current))
+    return size
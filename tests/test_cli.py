@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import patch
+from src.cli import run_cli
+
+@pytest.fixture
+def mock_manager():
+    with patch('src.cli.DictionaryManager') as mock_manager:
+        yield mock_manager.return_value
+
+def test_duplicates(mock_manager, capsys):
+    mock_manager.find_duplicates.return_value = [["cat", "kitty"]]
+    assert run_cli(["duplicates", "--threshold", "0.5"]) == 0
+    mock_manager.find_duplicates.assert_called_once_with(0.5)
+    mock_manager.wait_for_index.assert_called_once()
+    assert "Cluster 1: cat, kitty" in capsys.readouterr().out
+
+def test_duplicates_none_found(mock_manager, capsys):
+    mock_manager.find_duplicates.return_value = []
+    assert run_cli(["duplicates"]) == 0
+    assert "No near-duplicate definitions found." in capsys.readouterr().out
+
+def test_missing_command():
+    with pytest.raises(SystemExit):
+        run_cli([])
+
+def test_memory(capsys):
+    with patch('src.cli.memory_report') as mock_report, \
+         patch('src.cli.format_memory_report', return_value="report text"):
+        assert run_cli(["memory"]) == 0
+        mock_report.assert_called_once_with("data.json")
+    assert "report text" in capsys.readouterr().out
+
+def test_data_option(capsys):
+    with patch('src.cli.DictionaryManager') as mock_manager:
+        mock_manager.return_value.find_duplicates.return_value = []
+        run_cli(["--data", "other.dictz", "duplicates"])
+        mock_manager.assert_called_once_with("other.dictz")
+
+def test_convert(mock_manager, capsys):
+    assert run_cli(["convert", "data.dictz"]) == 0
+    mock_manager.export.assert_called_once_with("data.dictz", None)
+    mock_manager.wait_for_index.assert_called_once()
+    assert "Saved data.json as data.dictz" in capsys.readouterr().out
+
+def test_convert_codec(mock_manager):
+    assert run_cli(["convert", "data.dictz", "--codec", "lzma"]) == 0
+    mock_manager.export.assert_called_once_with("data.dictz", "lzma")
+
+def test_convert_codec_needs_compressed_target(mock_manager):
+    with pytest.raises(SystemExit):
+        run_cli(["convert", "copy.json", "--codec", "lzma"])
+    mock_manager.export.assert_not_called()
+
+def test_search(capsys):
+    with patch('src.cli.DictionaryFederation') as mock_federation:
+        federation = mock_federation.return_value
+        federation.search_terms.return_value = [("team.json", "cat", {"definition": "A small feline"})]
+        assert run_cli(["--mount", "team=team.json", "--mount", "other.json", "search", "cat"]) == 0
+        federation.mount.assert_any_call("data.json", "data.json")
+        federation.mount.assert_any_call("team", "team.json")
+        federation.mount.assert_any_call("other.json", "other.json")
+        federation.search_terms.assert_called_once_with("cat")
+        federation.close.assert_called_once()
+    assert "[team.json] cat: A small feline" in capsys.readouterr().out
+
+def test_search_words_none_found(capsys):
+    with patch('src.cli.DictionaryFederation') as mock_federation:
+        mock_federation.return_value.search_words.return_value = []
+        assert run_cli(["search", "cat", "--words"]) == 0
+        mock_federation.return_value.search_words.assert_called_once_with("cat")
+    assert "No matching terms found." in capsys.readouterr().out
+
+@pytest.mark.parametrize("mounts", [
+    ["data.json"],
+    ["team=a.json", "team=b.json"],
+    ["=team.json"],
+])
+def test_search_mount_conflicts(mounts, capsys):
+    argv = [arg for mount in mounts for arg in ("--mount", mount)] + ["search", "cat"]
+    with patch('src.cli.DictionaryFederation') as mock_federation, pytest.raises(SystemExit):
+        run_cli(argv)
+    mock_federation.assert_not_called()
+    assert "--mount" in capsys.readouterr().err
+
+def test_search_closes_federation_on_error():
+    with patch('src.cli.DictionaryFederation') as mock_federation:
+        mock_federation.return_value.search_terms.side_effect = OSError("unreadable")
+        with pytest.raises(OSError):
+            run_cli(["search", "cat"])
+        mock_federation.return_value.close.assert_called_once()
@@ -1,8 +1,10 @@
 import pytest
 import json
 import os
-from src.data_manager import JsonDataManager
-from unittest.mock import mock_open, patch
+import threading
+import zlib
+from src.data_manager import JsonDataManager, BlockCompressedDataManager, BackgroundSaver
+from unittest.mock import Mock, mock_open, patch
 
 @pytest.fixture
 def data_manager():
@@ -24,6 +26,149 @@ def test_load_valid_json(data_manager):
 def test_save_data(data_manager):
     test_data = {"key": "value"}
     mock_file = mock_open()
-    with patch('builtins.open', mock_file):
+    with patch('builtins.open', mock_file), \
+         patch('os.fsync') as mock_fsync, \
+         patch('os.replace') as mock_replace:
         data_manager.save(test_data)
-        mock_file.assert_called_once()
\ No newline at end of file
+        mock_file.assert_called_once()
+        mock_fsync.assert_called_once()
+        mock_replace.assert_called_once_with(data_manager.filepath + '.tmp', data_manager.filepath)
+
+def test_save_replaces_file_atomically(tmp_path):
+    target = tmp_path / "data.json"
+    target.write_text('{"old": "data"}')
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        manager = JsonDataManager('data.json')
+    manager.save({"new": "data"})
+    assert json.loads(target.read_text()) == {"new": "data"}
+    assert not os.path.exists(str(target) + '.tmp')
+
+def test_save_failure_keeps_original(tmp_path):
+    target = tmp_path / "data.json"
+    target.write_text('{"old": "data"}')
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        manager = JsonDataManager('data.json')
+    with pytest.raises(TypeError):
+        manager.save({"bad": object()})
+    assert json.loads(target.read_text()) == {"old": "data"}
+    assert not os.path.exists(str(target) + '.tmp')
+
+def test_background_saver_coalesces_requests():
+    started = threading.Event()
+    release = threading.Event()
+    saved = []
+    
+    def save(snapshot):
+        started.set()
+        release.wait(5)
+        saved.append(snapshot)
+    
+    saver = BackgroundSaver(save)
+    saver.request(1)
+    started.wait(5)
+    saver.request(2)
+    saver.request(3)
+    assert saver.busy
+    release.set()
+    saver.wait()
+    assert saved == [1, 3]
+    assert not saver.busy
+
+def test_background_saver_records_errors():
+    def save(snapshot):
+        raise OSError("disk full")
+    
+    saver = BackgroundSaver(save)
+    saver.request(1)
+    saver.wait()
+    assert isinstance(saver.last_error, OSError)
+
+def test_fingerprint_tracks_load_and_save(tmp_path):
+    target = tmp_path / "data.json"
+    target.write_text('{"old": "data"}')
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        manager = JsonDataManager('data.json')
+    manager.load()
+    loaded = manager.fingerprint
+    assert loaded["size"] == target.stat().st_size
+    manager.save({"new": "data"})
+    assert manager.fingerprint["sha256"] != loaded["sha256"]
+    assert manager.fingerprint["size"] == target.stat().st_size
+
+@pytest.fixture
+def block_data():
+    return {
+        f"term{i}": {"definition": f"A fairly long definition number {i} " * 5, "labels": ["even" if i % 2 else "odd"]}
+        for i in range(10)
+    }
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_block_compressed_round_trip(tmp_path, block_data, codec):
+    target = tmp_path / "data.dictz"
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        manager = BlockCompressedDataManager('data.dictz', codec=codec, block_size=3)
+    manager.save(block_data)
+    assert manager.fingerprint["size"] == target.stat().st_size
+    loaded = manager.load()
+    assert loaded == block_data
+    assert list(loaded) == list(block_data)
+    assert manager.read_entry("term7") == block_data["term7"]
+    assert manager.read_entry("missing") is None
+
+def test_block_compressed_reads_one_block(tmp_path, block_data):
+    target = tmp_path / "data.dictz"
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        manager = BlockCompressedDataManager('data.dictz', block_size=3)
+    manager.save(block_data)
+    mock_decompress = Mock(wraps=zlib.decompress)
+    with patch.dict(BlockCompressedDataManager.CODECS, {'zlib': (zlib.compress, mock_decompress)}):
+        assert manager.read_entry("term4") == block_data["term4"]
+    assert mock_decompress.call_count == 2  # header and one block
+
+def test_block_compressed_missing_or_invalid(tmp_path):
+    target = tmp_path / "data.dictz"
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        manager = BlockCompressedDataManager('data.dictz')
+    assert manager.load() == {}
+    assert manager.read_entry("term") is None
+    target.write_bytes(b'not a dictionary')
+    assert manager.load() == {}
+    target.write_bytes(BlockCompressedDataManager.MAGIC)
+    assert manager.load() == {}
+    assert manager.read_entry("term") is None
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_block_compressed_corrupt_block(tmp_path, block_data, codec):
+    target = tmp_path / "data.dictz"
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        manager = BlockCompressedDataManager('data.dictz', codec=codec, block_size=3)
+    manager.save(block_data)
+    content = bytearray(target.read_bytes())
+    content[-5] ^= 0xFF  # inside the last block, which holds term9
+    target.write_bytes(bytes(content))
+    
+    assert manager.load() == {}
+    assert manager.read_entry("term9") is None
+    assert manager.read_entry("term0") == block_data["term0"]
+
+def test_block_compressed_block_not_entries(tmp_path, block_data):
+    target = tmp_path / "data.dictz"
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        manager = BlockCompressedDataManager('data.dictz', block_size=3)
+    manager.save(block_data)
+    with patch('src.data_manager.json.loads', side_effect=[{"blocks": [[["term0"], 0, 1]]}, {"not": "a list"}]):
+        assert manager.read_entry("term0") is None
+
+def test_block_compressed_keeps_loaded_codec(tmp_path, block_data):
+    target = tmp_path / "data.dictz"
+    with patch('src.data_manager.app_data_path', return_value=str(target)):
+        BlockCompressedDataManager('data.dictz', codec='lzma').save(block_data)
+        manager = BlockCompressedDataManager('data.dictz')
+    manager.load()
+    assert manager.codec == 'lzma'
+    manager.save(block_data)
+    assert target.read_bytes().startswith(BlockCompressedDataManager.MAGIC + b'\x04lzma')
+
+def test_block_compressed_unsupported_codec():
+    with pytest.raises(ValueError):
+        BlockCompressedDataManager('data.dictz', codec='bz2')
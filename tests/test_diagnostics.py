@@ -0,0 +1,25 @@
+import pytest
+from unittest.mock import patch
+from src.diagnostics import memory_report, format_memory_report
+
+@pytest.fixture
+def report(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text('{"cat": {"definition": "A small mammal", "labels": ["animal"]}}')
+    with patch('src.data_manager.app_data_path', return_value=str(data_file)):
+        yield memory_report()
+
+def test_memory_report(report, tmp_path):
+    assert report["terms"] == 1
+    assert report["file_size"] == (tmp_path / "data.json").stat().st_size
+    assert set(report["breakdown"]) == {"term_keys", "entries", "definitions", "label_lists", "indexes"}
+    assert all(size > 0 for size in report["breakdown"].values())
+    assert report["total"] == sum(report["breakdown"].values())
+    assert report["bytes_per_term"] == report["total"]
+    assert report["load_peak"] >= report["load_current"] > 0
+
+def test_format_memory_report(report):
+    text = format_memory_report(report)
+    assert "term keys" in text
+    assert "Bytes per term" in text
+    assert "Memory / disk ratio" in text
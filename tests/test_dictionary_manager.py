@@ -1,11 +1,22 @@
 import pytest
+import json
+import threading
+import os
+import subprocess
+import sys
 from src.dictionary_manager import DictionaryManager
+from src.search_index import SearchIndex, ScanIndex, build_index
+from src.data_manager import BlockCompressedDataManager
+from src.events import ChangeEvent, ChangeKind
+from src.similarity import SimilarityEngine
 from unittest.mock import Mock, patch
 
 @pytest.fixture
-def dict_manager():
+def dict_manager(tmp_path):
     with patch('src.dictionary_manager.JsonDataManager') as mock_data_manager:
         mock_data_manager.return_value.load.return_value = {}
+        mock_data_manager.return_value.filepath = str(tmp_path / "data.json")
+        mock_data_manager.return_value.fingerprint = None
         manager = DictionaryManager()
         yield manager
 
@@ -49,6 +60,379 @@ def test_load_valid_json(data_manager):
 def test_save_data(data_manager):
     test_data = {"key": "value"}
     mock_file = mock_open()
-    with patch('builtins.open', mock_file):
+    with patch('builtins.open', mock_file), \
+         patch('os.fsync') as mock_fsync, \
+         patch('os.replace') as mock_replace:
         data_manager.save(test_data)
         mock_file.assert_called_once()
+        mock_fsync.assert_called_once()
+        mock_replace.assert_called_once_with(data_manager.filepath + '.tmp', data_manager.filepath)
+
+def test_search_words(dict_manager):
+    dict_manager.add_term("cobra", "A venomous snake")
+    dict_manager.add_term("python", "A programming language")
+    assert list(dict_manager.search_words("snake")) == ["cobra"]
+    dict_manager.remove_term("cobra")
+    assert dict_manager.search_words("snake") == {}
+
+def test_get_terms_by_labels_uses_index(dict_manager):
+    dict_manager.add_term("cobra", "A venomous snake", ["animal"])
+    dict_manager.add_term("python", "A programming language")
+    dict_manager.add_label_to_term("python", "code")
+    assert list(dict_manager.get_terms_by_labels(["code"])) == ["python"]
+    dict_manager.remove_label_from_term("python", "code")
+    assert dict_manager.get_terms_by_labels(["code"]) == {}
+
+def test_search_terms_normalized(dict_manager):
+    dict_manager.add_term("Café", "A coffee shop")
+    dict_manager.add_term("Tea", "A drink")
+    assert list(dict_manager.search_terms("cafe")) == ["Café"]
+    assert list(dict_manager.search_terms("")) == ["Café", "Tea"]
+
+def test_find_duplicates(dict_manager):
+    definition = "a small domesticated carnivorous mammal with soft fur, kept as a pet or for catching mice"
+    dict_manager.add_term("cat", definition)
+    dict_manager.add_term("kitty", definition + " indoors")
+    dict_manager.add_term("tree", "a woody perennial plant")
+    assert dict_manager.find_duplicates() == [["cat", "kitty"]]
+
+def test_memory_usage(dict_manager):
+    empty = dict_manager.memory_usage()
+    dict_manager.add_term("cat", "A small mammal " * 10, ["animal"])
+    usage = dict_manager.memory_usage()
+    assert usage["definitions"] > empty["definitions"]
+    assert usage["label_lists"] > empty["label_lists"]
+    assert usage["indexes"] > empty["indexes"]
+
+def test_change_events(dict_manager):
+    batches = []
+    dict_manager.subscribe(batches.append)
+    dict_manager.add_term("cat", "A small mammal")
+    dict_manager.add_term("cat", "A small feline")
+    dict_manager.add_label_to_term("cat", "animal")
+    dict_manager.remove_term("cat")
+    assert batches == [
+        [ChangeEvent(ChangeKind.TERM_ADDED, "cat")],
+        [ChangeEvent(ChangeKind.TERM_UPDATED, "cat")],
+        [ChangeEvent(ChangeKind.LABELS_CHANGED, "cat")],
+        [ChangeEvent(ChangeKind.TERM_REMOVED, "cat")],
+    ]
+    dict_manager.unsubscribe(batches.append)
+    dict_manager.add_term("dog", "A loyal animal")
+    assert len(batches) == 4
+
+def test_transaction_batches_events(dict_manager):
+    batches = []
+    dict_manager.subscribe(batches.append)
+    with dict_manager.transaction():
+        dict_manager.add_term("cat", "A small mammal")
+        with dict_manager.transaction():
+            dict_manager.add_term("dog", "A loyal animal")
+            dict_manager.add_label_to_term("cat", "animal")
+        assert batches == []
+    assert batches == [[
+        ChangeEvent(ChangeKind.TERM_ADDED, "cat"),
+        ChangeEvent(ChangeKind.TERM_ADDED, "dog"),
+    ]]
+
+def test_dispatcher_batches_events(dict_manager):
+    batches = []
+    scheduled = []
+    dict_manager.subscribe(batches.append)
+    dict_manager.set_dispatcher(scheduled.append)
+    dict_manager.add_term("cat", "A small mammal")
+    dict_manager.remove_term("cat")
+    dict_manager.add_term("dog", "A loyal animal")
+    assert len(scheduled) == 1
+    assert batches == []
+    scheduled[0]()
+    assert batches == [[ChangeEvent(ChangeKind.TERM_ADDED, "dog")]]
+
+def test_save_data_skips_when_unchanged(dict_manager):
+    dict_manager.save_data()
+    dict_manager._data_manager.save.assert_not_called()
+    dict_manager.add_term("cat", "A small mammal")
+    assert dict_manager.has_unsaved_changes
+    dict_manager.save_data()
+    dict_manager._data_manager.save.assert_called_once()
+    assert not dict_manager.has_unsaved_changes
+
+def test_save_in_background_uses_snapshot(dict_manager):
+    saved = []
+    dict_manager._data_manager.save.side_effect = lambda data: saved.append(data)
+    dict_manager.add_term("cat", "A small mammal", ["animal"])
+    dict_manager.save_in_background()
+    dict_manager.add_label_to_term("cat", "pet")
+    dict_manager.add_term("dog", "A loyal animal")
+    dict_manager._saver.wait()
+    assert saved == [{"cat": {"definition": "A small mammal", "labels": ["animal"]}}]
+    assert dict_manager.has_unsaved_changes
+    dict_manager.save_data()
+    assert saved[-1]["cat"]["labels"] == ["animal", "pet"]
+    assert "dog" in saved[-1]
+
+def test_last_save_error(dict_manager):
+    dict_manager._data_manager.save.side_effect = OSError("disk full")
+    dict_manager.add_term("cat", "A small mammal")
+    dict_manager.save_in_background()
+    dict_manager._saver.wait()
+    assert isinstance(dict_manager.last_save_error, OSError)
+    
+    dict_manager._data_manager.save.side_effect = None
+    dict_manager.save_in_background()
+    dict_manager._saver.wait()
+    assert dict_manager.last_save_error is None
+
+@pytest.fixture
+def data_file(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({
+        f"term{i}": {"definition": f"definition {i}", "labels": ["even" if i % 2 else "odd"]}
+        for i in range(20)
+    }))
+    with patch('src.data_manager.app_data_path', return_value=str(data_file)), \
+         patch('src.dictionary_manager.CACHE_THRESHOLD', 0):
+        yield data_file
+
+def test_index_cache_skips_rebuild(data_file):
+    first = DictionaryManager()
+    first._index_future.result(timeout=5)
+    assert first.search_words("definition 3") == {"term3": {"definition": "definition 3", "labels": ["even"]}}
+    
+    with patch('src.dictionary_manager.build_index') as mock_build:
+        second = DictionaryManager()
+        mock_build.assert_not_called()
+    assert isinstance(second._index, SearchIndex)
+    assert list(second.search_terms("term1")) == ["term1"] + [f"term{i}" for i in range(10, 20)]
+
+def test_index_rebuilds_in_background(data_file):
+    release = threading.Event()
+    
+    def slow_build(dictionary):
+        release.wait(5)
+        return build_index(dictionary)
+    
+    with patch('src.dictionary_manager.build_index', side_effect=slow_build):
+        manager = DictionaryManager()
+        assert isinstance(manager._index, ScanIndex)
+        manager.add_term("extra", "definition extra", ["odd"])
+        manager.remove_term("term0")
+        assert "extra" in manager.get_terms_by_labels(["odd"])
+        release.set()
+        manager._index_future.result(timeout=5)
+    
+    assert "extra" in manager.search_words("extra")
+    assert isinstance(manager._index, SearchIndex)
+    assert "term0" not in manager.get_terms_by_labels(["odd"])
+    assert "extra" in manager.get_terms_by_labels(["odd"])
+
+def test_index_build_abandoned_at_exit(data_file):
+    release = threading.Event()
+    
+    def slow_build(dictionary):
+        release.wait(5)
+        return build_index(dictionary)
+    
+    partial = str(data_file) + ".idx.tmp"
+    with open(partial, 'w') as f:
+        f.write("left by an earlier exit")
+    with patch('src.dictionary_manager.build_index', side_effect=slow_build):
+        DictionaryManager()
+        builds = [thread for thread in threading.enumerate() if thread.name == "dictionary-index"]
+        release.set()
+    assert builds and all(thread.daemon for thread in builds)
+    assert not os.path.exists(partial)
+
+def test_cli_command_writes_index_cache(data_file):
+    script = (
+        "import sys; from unittest.mock import patch\n"
+        "with patch('src.data_manager.app_data_path', return_value=sys.argv[1]), "
+        "patch('src.dictionary_manager.CACHE_THRESHOLD', 0):\n"
+        "    from src.cli import run_cli\n"
+        "    run_cli(['duplicates'])\n"
+    )
+    subprocess.run([sys.executable, "-c", script, str(data_file)], check=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert os.path.exists(str(data_file) + ".idx")
+    assert not os.path.exists(str(data_file) + ".idx.tmp")
+
+def test_memory_usage_waits_for_index(data_file):
+    release = threading.Event()
+    
+    def slow_build(dictionary):
+        release.wait(5)
+        return build_index(dictionary)
+    
+    with patch('src.dictionary_manager.build_index', side_effect=slow_build):
+        manager = DictionaryManager()
+        threading.Timer(0.05, release.set).start()
+        usage = manager.memory_usage()
+    assert isinstance(manager._index, SearchIndex)
+    assert usage["indexes"] > 1000
+
+def test_history_saved_with_snapshot_it_covers(data_file):
+    definitions = [
+        "A small domesticated carnivorous mammal with soft fur",
+        "A small domesticated carnivorous mammal with soft fur and whiskers",
+        "A small domesticated carnivorous mammal with soft fur, whiskers and claws",
+    ]
+    manager = DictionaryManager()
+    manager.add_term("cat", definitions[0])
+    manager.save_data()
+    
+    writing, release = threading.Event(), threading.Event()
+    original_save = manager._data_manager.save
+    
+    def slow_save(dictionary):
+        writing.set()
+        release.wait(5)
+        original_save(dictionary)
+    
+    manager.add_term("cat", definitions[1])
+    with patch.object(manager._data_manager, 'save', side_effect=slow_save):
+        manager.save_in_background()
+        assert writing.wait(5)
+        manager.add_term("cat", definitions[2])
+        release.set()
+        manager._saver.wait()
+    
+    # Reopened without a final save, as after a crash
+    reloaded = DictionaryManager()
+    assert reloaded.get_term_definition("cat") == definitions[1]
+    assert [text for _, text in reloaded.get_history("cat")] == [definitions[0]]
+    
+    manager.save_data()
+    reloaded = DictionaryManager()
+    assert [text for _, text in reloaded.get_history("cat")] == definitions[1::-1]
+
+def test_save_data_refreshes_index_cache(data_file):
+    manager = DictionaryManager()
+    manager._index_future.result(timeout=5)
+    manager.add_term("extra", "definition extra")
+    manager.save_data()
+    manager._cache_saver.wait()
+    
+    with patch('src.dictionary_manager.build_index') as mock_build:
+        reloaded = DictionaryManager()
+        mock_build.assert_not_called()
+    assert "extra" in reloaded.search_words("extra")
+
+def test_save_data_writes_index_cache_in_background(data_file):
+    manager = DictionaryManager()
+    manager.wait_for_index()
+    manager.add_term("extra", "definition extra")
+    writers = []
+    
+    with patch.object(manager._index_cache, 'write',
+                      side_effect=lambda *args: writers.append(threading.current_thread())):
+        manager.save_data()
+        manager._cache_saver.wait()
+    assert writers and threading.main_thread() not in writers
+
+def test_index_cache_skipped_when_edited_during_save(data_file):
+    manager = DictionaryManager()
+    manager.wait_for_index()
+    manager.add_term("extra", "definition extra")
+    
+    def edit_while_encoding(index):
+        manager.add_term("late", "definition late")
+        return b''
+    
+    with patch('src.dictionary_manager.encode_index', side_effect=edit_while_encoding), \
+         patch.object(manager._index_cache, 'write') as mock_write:
+        manager.save_in_background()
+        manager._saver.wait()
+        manager._cache_saver.wait()
+    mock_write.assert_not_called()
+    
+    manager.save_data()
+    manager._cache_saver.wait()
+    with patch('src.dictionary_manager.build_index') as mock_build:
+        reloaded = DictionaryManager()
+        mock_build.assert_not_called()
+    assert "late" in reloaded.search_words("late")
+
+def test_block_compressed_storage_and_export(tmp_path):
+    with patch('src.data_manager.app_data_path', side_effect=lambda name: str(tmp_path / name)):
+        manager = DictionaryManager('data.dictz')
+        assert isinstance(manager._data_manager, BlockCompressedDataManager)
+        manager.add_term("cat", "A small mammal", ["animal"])
+        manager.save_data()
+        manager.export('copy.json')
+        
+        assert DictionaryManager('data.dictz').get_all_terms() == manager.get_all_terms()
+        assert json.loads((tmp_path / 'copy.json').read_text()) == manager.get_all_terms()
+
+def test_block_compressed_codec_kept(tmp_path):
+    with patch('src.data_manager.app_data_path', side_effect=lambda name: str(tmp_path / name)):
+        DictionaryManager().export('data.dictz', 'lzma')
+        manager = DictionaryManager('data.dictz')
+        manager.add_term("cat", "A small mammal")
+        manager.save_data()
+    assert manager._data_manager.codec == 'lzma'
+    assert (tmp_path / 'data.dictz').read_bytes().startswith(BlockCompressedDataManager.MAGIC + b'\x04lzma')
+
+def test_related_terms(dict_manager):
+    dict_manager.add_term("cobra", "Venomous snake found in Asia")
+    dict_manager.add_term("python", "Programming language")
+    assert dict_manager.related_terms("cobra") == []
+    dict_manager.add_term("viper", "Venomous snake with fangs")
+    assert [term for term, _ in dict_manager.related_terms("cobra")] == ["viper"]
+    dict_manager.remove_term("viper")
+    assert dict_manager.related_terms("cobra") == []
+
+def test_related_terms_built_in_background(dict_manager):
+    dict_manager.add_term("cobra", "Venomous snake found in Asia")
+    dict_manager.add_term("python", "Programming language")
+    release = threading.Event()
+    original_build = SimilarityEngine.build
+    
+    def slow_build(engine, documents):
+        release.wait(5)
+        original_build(engine, documents)
+    
+    with patch.object(SimilarityEngine, 'build', slow_build):
+        assert not dict_manager.related_terms_ready
+        dict_manager.prepare_related_terms()
+        dict_manager.add_term("viper", "Venomous snake with fangs")
+        dict_manager.remove_term("python")
+        assert not dict_manager.related_terms_ready
+        release.set()
+        dict_manager._similarity_future.result(timeout=5)
+    
+    assert dict_manager.related_terms_ready
+    assert [term for term, _ in dict_manager.related_terms("cobra")] == ["viper"]
+    assert dict_manager.related_terms("python") == []
+
+def test_request_related_terms(dict_manager):
+    dict_manager.add_term("cobra", "Venomous snake found in Asia")
+    dict_manager.add_term("viper", "Venomous snake with fangs")
+    with pytest.raises(RuntimeError):
+        dict_manager.request_related_terms("cobra")
+    dict_manager.related_terms("cobra")
+    future = dict_manager.request_related_terms("cobra")
+    assert [term for term, _ in future.result(timeout=5)] == ["viper"]
+
+def test_get_history(dict_manager):
+    dict_manager.add_term("cat", "A small mammal", ["animal"])
+    dict_manager.add_term("cat", "A small domesticated mammal", ["animal"])
+    dict_manager.remove_term("cat")
+    dict_manager.add_term("cat", "A pet", ["animal"])
+    dict_manager.add_label_to_term("cat", "pet")
+    dict_manager.save_data()
+    
+    assert [text for _, text in dict_manager.get_history("cat")] == [
+        "A small domesticated mammal", "A small mammal"
+    ]
+    dict_manager.remove_term("cat")
+    assert [text for _, text in dict_manager.get_history("cat")][0] == "A pet"
+
+def test_history_not_read_on_load(tmp_path):
+    with patch('src.dictionary_manager.JsonDataManager') as mock_data_manager, \
+         patch('src.history.RevisionHistory._read_bucket') as mock_read:
+        mock_data_manager.return_value.load.return_value = {"cat": {"definition": "A pet", "labels": []}}
+        mock_data_manager.return_value.filepath = str(tmp_path / "data.json")
+        mock_data_manager.return_value.fingerprint = None
+        manager = DictionaryManager()
+        manager.add_term("cat", "A small mammal")
+        mock_read.assert_not_called()
@@ -0,0 +1,33 @@
+import pytest
+from src.duplicates import shingles, minhash_signature, jaccard, find_duplicate_clusters
+
+BASE = "a domesticated carnivorous mammal kept as a pet and valued for companionship and hunting vermin"
+
+def test_shingles():
+    assert shingles("One two three four") == {"one two three", "two three four"}
+    assert shingles("Short text") == {"short text"}
+    assert shingles("") == set()
+
+def test_minhash_signature():
+    assert minhash_signature(set()) is None
+    signature = minhash_signature({"a b c"}, num_bins=8)
+    assert len(signature) == 8
+    assert minhash_signature({"a b c"}, num_bins=8) == signature
+
+def test_jaccard():
+    assert jaccard({"a", "b"}, {"b", "c"}) == pytest.approx(1 / 3)
+    assert jaccard(set(), set()) == 1.0
+
+def test_find_duplicate_clusters():
+    texts = {
+        "cat": BASE,
+        "kitty": BASE + " indoors",
+        "house cat": BASE.upper(),
+        "dog": "a loyal animal descended from wolves that barks at strangers",
+        "tree": "a woody perennial plant with a trunk and branches",
+    }
+    assert find_duplicate_clusters(texts) == [["cat", "house cat", "kitty"]]
+
+def test_find_duplicate_clusters_threshold():
+    texts = {"one": "alpha beta gamma delta", "two": "alpha beta gamma epsilon"}
+    assert find_duplicate_clusters(texts, threshold=0.9) == []
@@ -0,0 +1,28 @@
+import pytest
+from src.events import ChangeEvent, ChangeKind, coalesce
+
+ADDED = ChangeKind.TERM_ADDED
+REMOVED = ChangeKind.TERM_REMOVED
+UPDATED = ChangeKind.TERM_UPDATED
+LABELS = ChangeKind.LABELS_CHANGED
+
+@pytest.mark.parametrize("kinds, expected", [
+    ([ADDED], ADDED),
+    ([ADDED, LABELS, UPDATED], ADDED),
+    ([ADDED, REMOVED], None),
+    ([REMOVED, ADDED], UPDATED),
+    ([UPDATED, REMOVED], REMOVED),
+    ([LABELS, LABELS], LABELS),
+    ([LABELS, UPDATED], UPDATED),
+])
+def test_coalesce(kinds, expected):
+    events = coalesce([ChangeEvent(kind, "term") for kind in kinds])
+    assert events == ([ChangeEvent(expected, "term")] if expected else [])
+
+def test_coalesce_keeps_first_change_order():
+    events = coalesce([
+        ChangeEvent(ADDED, "b"),
+        ChangeEvent(ADDED, "a"),
+        ChangeEvent(LABELS, "b"),
+    ])
+    assert events == [ChangeEvent(ADDED, "b"), ChangeEvent(ADDED, "a")]
@@ -0,0 +1,57 @@
+import pytest
+import json
+from src.federation import DictionaryFederation
+
+@pytest.fixture
+def federation(tmp_path):
+    (tmp_path / "animals.json").write_text(json.dumps({
+        "cat": {"definition": "A small feline", "labels": ["pet"]},
+        "Café cat": {"definition": "A cat living in a café", "labels": []},
+    }))
+    (tmp_path / "plants.json").write_text(json.dumps({
+        "catnip": {"definition": "A plant loved by cats", "labels": ["herb"]},
+    }))
+    (tmp_path / "unused.json").write_text(json.dumps({}))
+    federation = DictionaryFederation(max_workers=2)
+    federation.mount("animals", str(tmp_path / "animals.json"))
+    federation.mount("plants", str(tmp_path / "plants.json"))
+    federation.mount("unused", str(tmp_path / "unused.json"))
+    yield federation
+    federation.close()
+
+def test_mounts_lazily(federation):
+    assert federation.names == ["animals", "plants", "unused"]
+    assert not any(federation.is_open(name) for name in federation.names)
+    federation.search_terms("cat", sources=["plants"])
+    assert federation.is_open("plants")
+    assert not federation.is_open("animals")
+
+def test_mount_duplicate_name(federation):
+    with pytest.raises(ValueError):
+        federation.mount("animals", "other.json")
+
+def test_search_terms_merges_with_source(federation):
+    results = federation.search_terms("CAT")
+    assert [(source, term) for source, term, _ in results] == [
+        ("animals", "cat"),
+        ("animals", "Café cat"),
+        ("plants", "catnip"),
+    ]
+    assert results[2][2] == {"definition": "A plant loved by cats", "labels": ["herb"]}
+
+def test_search_words(federation):
+    results = federation.search_words("cafe")
+    assert [(source, term) for source, term, _ in results] == [("animals", "Café cat")]
+
+def test_get_terms_by_labels(federation):
+    results = federation.get_terms_by_labels(["pet", "herb"])
+    assert [(source, term) for source, term, _ in results] == [("animals", "cat"), ("plants", "catnip")]
+
+def test_get_opens_once(federation):
+    assert federation.get("animals") is federation.get("animals")
+
+def test_unmount_saves_changes(federation, tmp_path):
+    federation.get("plants").add_term("fern", "A flowerless plant")
+    federation.unmount("plants")
+    assert "plants" not in federation.names
+    assert "fern" in json.loads((tmp_path / "plants.json").read_text())
@@ -1,7 +1,11 @@
 import pytest
 import tkinter as tk
+from concurrent.futures import Future
 from unittest.mock import Mock, patch, MagicMock
-from src.gui import DictionaryApp
+from src.gui import (
+    DictionaryApp, AUTOSAVE_INTERVAL_MS, RELATED_TERMS_COUNT, RELATED_TERMS_POLL_MS, RELATED_TERMS_RESULT_POLL_MS
+)
+from src.events import ChangeEvent, ChangeKind
 
 @pytest.fixture
 def mock_root():
@@ -69,9 +73,8 @@ def test_search_terms(app):
     # Setup
     app.search_entry = Mock()
     app.search_entry.get.return_value = "test"
-    app.dict_manager.get_all_terms.return_value = {
-        "test": "definition",
-        "other": "other def"
+    app.dict_manager.search_terms.return_value = {
+        "test": {"definition": "definition", "labels": []}
     }
     
     # Mock treeview children
@@ -81,8 +84,9 @@ def test_search_terms(app):
     app.search_terms()
     
     # Verify
+    app.dict_manager.search_terms.assert_called_once_with("test")
     assert app.treeview.delete.call_count == len(app.treeview.get_children())
-    app.treeview.insert.assert_called_with("", tk.END, values=("test", "definition"))
+    app.treeview.insert.assert_called_with("", tk.END, values=("test", "definition", ""))
 
 def test_on_closing(app):
     # Execute
@@ -240,4 +244,274 @@ def test_populate_treeview(app):
     assert app.treeview.delete.call_count == len(app.treeview.get_children())
     assert app.treeview.insert.call_count == 2
     app.treeview.insert.assert_any_call("", tk.END, values=('term1', 'def1'))
-    app.treeview.insert.assert_any_call("", tk.END, values=('term2', 'def2')) 
\ No newline at end of file
+    app.treeview.insert.assert_any_call("", tk.END, values=('term2', 'def2')) 
+
+def test_show_duplicates(app):
+    app.dict_manager.find_duplicates.return_value = [["cat", "kitty"]]
+    app.dict_manager.get_term_definition.return_value = "definition"
+    
+    with patch('src.gui.tk.Toplevel') as mock_toplevel, \
+         patch('src.gui.ttk') as mock_ttk:
+        app.show_duplicates()
+        
+        mock_toplevel.assert_called_once_with(app.root)
+        report = mock_ttk.Treeview.return_value
+        report.insert.assert_any_call("", tk.END, values=(1, "cat", "definition"))
+        report.insert.assert_any_call("", tk.END, values=(1, "kitty", "definition"))
+
+def test_show_duplicates_none_found(app):
+    app.dict_manager.find_duplicates.return_value = []
+    
+    with patch('src.gui.messagebox.showinfo') as mock_info, \
+         patch('src.gui.tk.Toplevel') as mock_toplevel:
+        app.show_duplicates()
+        
+        mock_info.assert_called_once_with("Duplicates", "No near-duplicate definitions found.")
+        mock_toplevel.assert_not_called()
+
+def test_subscribes_to_changes(app, mock_root):
+    app.dict_manager.set_dispatcher.assert_called_once_with(mock_root.after_idle)
+    app.dict_manager.subscribe.assert_called_once_with(app._on_dictionary_changed)
+
+def test_on_dictionary_changed(app):
+    app._term_items = {"old": "item1", "changed": "item2"}
+    app.treeview.insert.return_value = "item3"
+    app.dict_manager.get_term_definition.return_value = "definition"
+    app.dict_manager.get_term_labels.return_value = ["label"]
+    app.dict_manager.get_all_labels.return_value = set()
+    
+    app._on_dictionary_changed([
+        ChangeEvent(ChangeKind.TERM_REMOVED, "old"),
+        ChangeEvent(ChangeKind.TERM_UPDATED, "changed"),
+        ChangeEvent(ChangeKind.TERM_ADDED, "new"),
+    ])
+    
+    app.treeview.delete.assert_called_once_with("item1")
+    app.treeview.item.assert_called_once_with("item2", values=("changed", "definition", "label"))
+    app.treeview.insert.assert_called_once_with("", tk.END, values=("new", "definition", "label"))
+    assert app._term_items == {"changed": "item2", "new": "item3"}
+
+def test_on_dictionary_changed_respects_search(app):
+    app._view_search = "other"
+    app._term_items = {}
+    app.dict_manager.matches_search.return_value = False
+    app.dict_manager.get_all_labels.return_value = set()
+    
+    app._on_dictionary_changed([ChangeEvent(ChangeKind.TERM_ADDED, "new")])
+    
+    app.dict_manager.matches_search.assert_called_once_with("new", "other")
+    app.treeview.insert.assert_not_called()
+
+def test_autosave(app, mock_root):
+    mock_root.after.reset_mock()
+    app.dict_manager.last_save_error = None
+    
+    app._autosave()
+    
+    app.dict_manager.save_in_background.assert_called_once()
+    mock_root.after.assert_called_once_with(AUTOSAVE_INTERVAL_MS, app._autosave)
+
+def test_autosave_reports_failure_once(app):
+    app.dict_manager.last_save_error = OSError("disk full")
+    
+    with patch('src.gui.messagebox.showwarning') as mock_warning:
+        app._autosave()
+        app._autosave()
+        mock_warning.assert_called_once()
+        assert "disk full" in mock_warning.call_args.args[1]
+        
+        app.dict_manager.last_save_error = None
+        app._autosave()
+        app.dict_manager.last_save_error = OSError("read-only")
+        app._autosave()
+        assert mock_warning.call_count == 2
+
+def test_on_closing_cancels_autosave(app, mock_root):
+    app.on_closing()
+    
+    mock_root.after_cancel.assert_called_once_with(app._autosave_job)
+
+def test_show_related_terms(app):
+    app.related_treeview = Mock()
+    app.related_treeview.get_children.return_value = ['old']
+    app.treeview.selection.return_value = ['item1']
+    app.treeview.item.return_value = {'values': ('cobra', 'A venomous snake', '')}
+    future = Future()
+    future.set_result([("viper", 0.75)])
+    app.dict_manager.request_related_terms.return_value = future
+    
+    app.show_related_terms()
+    
+    app.related_treeview.delete.assert_called_once_with('old')
+    app.dict_manager.request_related_terms.assert_called_once_with('cobra', RELATED_TERMS_COUNT)
+    app.related_treeview.insert.assert_called_once_with("", tk.END, values=("viper", "0.75"))
+
+def test_show_related_terms_waits_for_query(app, mock_root):
+    app.related_treeview = Mock()
+    app.related_treeview.get_children.return_value = []
+    app.treeview.selection.return_value = ['item1']
+    app.treeview.item.return_value = {'values': ('cobra', 'A venomous snake', '')}
+    first, second = Future(), Future()
+    app.dict_manager.request_related_terms.side_effect = [first, second]
+    mock_root.after.reset_mock()
+    
+    app.show_related_terms()
+    mock_root.after.assert_called_once_with(RELATED_TERMS_RESULT_POLL_MS, app._show_related_results)
+    app.related_treeview.insert.assert_not_called()
+    
+    # Selecting another term drops the unfinished query
+    app.show_related_terms()
+    assert first.cancelled()
+    second.set_result([("viper", 0.75)])
+    app._show_related_results()
+    app.related_treeview.insert.assert_called_once_with("", tk.END, values=("viper", "0.75"))
+
+def test_show_related_terms_while_building(app, mock_root):
+    app.related_treeview = Mock()
+    app.related_treeview.get_children.return_value = []
+    app.treeview.selection.return_value = ['item1']
+    app.treeview.item.return_value = {'values': ('cobra', 'A venomous snake', '')}
+    app.dict_manager.related_terms_ready = False
+    mock_root.after.reset_mock()
+    
+    app.show_related_terms()
+    
+    app.dict_manager.prepare_related_terms.assert_called_once()
+    app.dict_manager.request_related_terms.assert_not_called()
+    app.related_treeview.insert.assert_called_once_with("", tk.END, values=("Loading...", ""))
+    mock_root.after.assert_called_once_with(RELATED_TERMS_POLL_MS, app.show_related_terms)
+    
+    app.dict_manager.related_terms_ready = True
+    future = Future()
+    future.set_result([("viper", 0.75)])
+    app.dict_manager.request_related_terms.return_value = future
+    app.show_related_terms()
+    mock_root.after_cancel.assert_called_once_with(mock_root.after.return_value)
+    app.related_treeview.insert.assert_called_with("", tk.END, values=("viper", "0.75"))
+
+def test_show_related_terms_no_selection(app):
+    app.related_treeview = Mock()
+    app.related_treeview.get_children.return_value = []
+    app.treeview.selection.return_value = []
+    
+    app.show_related_terms()
+    
+    app.dict_manager.request_related_terms.assert_not_called()
+
+def test_on_related_double_click(app):
+    app.related_treeview = Mock()
+    app.related_treeview.identify.return_value = 'related1'
+    app.related_treeview.item.return_value = {'values': ('viper', '0.75')}
+    app._term_items = {'viper': 'item7'}
+    
+    app._on_related_double_click(Mock(x=1, y=2))
+    
+    app.treeview.selection_set.assert_called_once_with('item7')
+    app.treeview.see.assert_called_once_with('item7')
+
+def test_show_history(app):
+    app.treeview.selection.return_value = ['item1']
+    app.treeview.item.return_value = {'values': ('cat', 'A pet', '')}
+    app.dict_manager.get_history.return_value = [(0.0, "A small mammal")]
+    
+    with patch('src.gui.tk.Toplevel') as mock_toplevel, \
+         patch('src.gui.ttk') as mock_ttk:
+        app.show_history()
+        
+        app.dict_manager.get_history.assert_called_once_with('cat')
+        mock_toplevel.assert_called_once_with(app.root)
+        report = mock_ttk.Treeview.return_value
+        values = report.insert.call_args.kwargs['values']
+        assert values[1] == "A small mammal"
+
+def test_show_history_none(app):
+    app.treeview.selection.return_value = ['item1']
+    app.treeview.item.return_value = {'values': ('cat', 'A pet', '')}
+    app.dict_manager.get_history.return_value = []
+    
+    with patch('src.gui.messagebox.showinfo') as mock_info, \
+         patch('src.gui.tk.Toplevel') as mock_toplevel:
+        app.show_history()
+        
+        mock_info.assert_called_once_with("History", "'cat' has no earlier definitions.")
+        mock_toplevel.assert_not_called()
+
+def test_show_history_no_selection(app):
+    app.treeview.selection.return_value = []
+    
+    with patch('src.gui.messagebox.showerror') as mock_error:
+        app.show_history()
+        
+        mock_error.assert_called_once_with("Error", "Please select a term to view its history!")
+        app.dict_manager.get_history.assert_not_called()
+
+@pytest.fixture
+def mounted_app(mock_root):
+    with patch('src.gui.ttk') as mock_ttk, \
+         patch('src.gui.messagebox'), \
+         patch('src.gui.DictionaryManager'), \
+         patch('src.gui.DictionaryFederation') as mock_federation:
+        mock_treeview = Mock()
+        mock_ttk.Treeview.return_value = mock_treeview
+        mock_treeview.get_children.return_value = []
+        mock_treeview.insert.side_effect = lambda parent, index, values: f"row-{values[0]}"
+        
+        app = DictionaryApp(mock_root, 'data.json', [("team", "team.json")])
+        app.treeview = mock_treeview
+        app.dict_manager.search_terms.return_value = {"cat": {"definition": "A pet", "labels": ["animal"]}}
+        app.dict_manager.get_terms_by_labels.return_value = {"cat": {"definition": "A pet", "labels": ["animal"]}}
+        yield app, mock_federation.return_value, mock_ttk
+
+def test_mounts_add_source_column(mounted_app):
+    app, federation, mock_ttk = mounted_app
+    federation.mount.assert_called_once_with("team", "team.json")
+    assert mock_ttk.Treeview.call_args_list[0].kwargs["columns"] == ("Term", "Definition", "Labels", "Source")
+    federation.search_terms.assert_not_called()
+
+def test_search_fans_out_to_mounts(mounted_app):
+    app, federation, _ = mounted_app
+    federation.search_terms.return_value = [("team", "catnip", {"definition": "A herb", "labels": []})]
+    app.search_entry = Mock()
+    app.search_entry.get.return_value = "cat"
+    
+    app.search_terms()
+    
+    federation.search_terms.assert_called_once_with("cat")
+    app.treeview.insert.assert_any_call("", tk.END, values=("cat", "A pet", "animal", "data.json"))
+    app.treeview.insert.assert_any_call("", tk.END, values=("catnip", "A herb", "", "team"))
+    
+    app.search_entry.get.return_value = ""
+    app.search_terms()
+    federation.search_terms.assert_called_once()
+
+def test_label_filter_fans_out_to_mounts(mounted_app):
+    app, federation, _ = mounted_app
+    federation.get_terms_by_labels.return_value = [("team", "dog", {"definition": "A pet", "labels": ["animal"]})]
+    checked = Mock()
+    checked.get.return_value = True
+    app.label_vars = {"animal": (checked, Mock())}
+    
+    app.apply_filters()
+    
+    federation.get_terms_by_labels.assert_called_once_with(["animal"])
+    app.treeview.insert.assert_any_call("", tk.END, values=("dog", "A pet", "animal", "team"))
+
+def test_mounted_terms_read_only(mounted_app):
+    app, federation, _ = mounted_app
+    federation.search_terms.return_value = [("team", "catnip", {"definition": "A herb", "labels": []})]
+    app.search_entry = Mock()
+    app.search_entry.get.return_value = "cat"
+    app.search_terms()
+    app.treeview.selection.return_value = ["row-catnip"]
+    app.treeview.item.return_value = {'values': ('catnip', 'A herb', '', 'team')}
+    
+    with patch('src.gui.messagebox.showerror') as mock_error:
+        app.remove_term()
+        app.edit_term()
+        mock_error.assert_called_with("Error", "Terms from 'team' are read-only!")
+    app.dict_manager.remove_term.assert_not_called()
+
+def test_on_closing_closes_mounts(mounted_app):
+    app, federation, _ = mounted_app
+    app.on_closing()
+    federation.close.assert_called_once()
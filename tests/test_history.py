@@ -0,0 +1,159 @@
+import pytest
+import json
+import os
+from unittest.mock import patch
+from src.history import RevisionHistory, MAX_DELTA_WORDS, make_delta, apply_delta, atomic_open as history_atomic_open
+
+@pytest.fixture
+def history(tmp_path):
+    return RevisionHistory(str(tmp_path / "data.json.revisions"), keyframe_interval=3)
+
+def read_file(history, term):
+    with open(history._bucket_path(term), encoding='utf-8') as f:
+        return json.load(f)["terms"]
+
+@pytest.mark.parametrize("base, target", [
+    ("", "new text"),
+    ("old text", ""),
+    ("A small mammal", "A small domesticated mammal"),
+    ("Café au lait", "Cafe with milk"),
+    ("  Leading space,\tand\n\nline breaks ", "Leading space, and\nline breaks"),
+])
+def test_delta_round_trip(base, target):
+    assert apply_delta(base, make_delta(base, target)) == target
+
+def test_delta_copies_shared_text():
+    delta = make_delta("A small mammal kept as a pet", "A small mammal kept indoors")
+    assert delta[0] == [0, 20]
+    assert sum(len(op) for op in delta if isinstance(op, str)) < 10
+
+def test_delta_skips_long_texts():
+    assert make_delta("word " * (MAX_DELTA_WORDS + 1), "word") is None
+
+def test_record_change(history):
+    history.record_change("cat", "A small mammal", "A small domesticated mammal")
+    history.record_change("cat", "A small domesticated mammal", "A pet")
+    
+    revisions = history.get_revisions("cat", "A pet")
+    assert [text for _, text in revisions] == ["A small domesticated mammal", "A small mammal"]
+
+def test_unchanged_definition_not_recorded(history):
+    history.record_change("cat", "A small mammal", "A small mammal")
+    assert history.get_revisions("cat", "A small mammal") == []
+
+def test_edit_as_remove_and_add(history):
+    old = "A small domesticated carnivorous mammal with soft fur"
+    new = "A small domesticated carnivorous mammal with soft fur and whiskers"
+    history.record_removal("cat", old)
+    history.record_addition("cat", new)
+    history.save()
+    
+    assert "delta" in read_file(history, "cat")["cat"][0]
+    assert [text for _, text in history.get_revisions("cat", new)] == [old]
+
+def test_delta_made_when_saving(history):
+    old = "A small domesticated carnivorous mammal with soft fur"
+    new = "A small domesticated carnivorous mammal with soft fur and whiskers"
+    with patch('src.history.make_delta', wraps=make_delta) as mock_make_delta:
+        history.record_change("cat", old, new)
+        mock_make_delta.assert_not_called()
+        history.save()
+        mock_make_delta.assert_called_once_with(new, old)
+    assert "delta" in read_file(history, "cat")["cat"][0]
+
+def test_long_definition_kept_in_full(history):
+    old = "word " * (MAX_DELTA_WORDS + 1)
+    history.record_change("cat", old, old + "more")
+    history.save()
+    assert read_file(history, "cat")["cat"][0]["text"] == old
+
+def test_short_delta_kept_in_full(history):
+    history.record_change("cat", "A pet", "A small pet")
+    history.save()
+    assert read_file(history, "cat")["cat"][0]["text"] == "A pet"
+
+def test_edit_without_change_dropped(history):
+    history.record_removal("cat", "A small mammal")
+    history.record_addition("cat", "A small mammal")
+    history.save()
+    
+    assert not os.path.exists(history.directory)
+    assert history.get_revisions("cat", "A small mammal") == []
+
+def test_removed_term_kept_in_full(history):
+    history.record_removal("cat", "A small mammal")
+    history.save()
+    
+    assert read_file(history, "cat")["cat"][0]["text"] == "A small mammal"
+    assert [text for _, text in history.get_revisions("cat", None)] == ["A small mammal"]
+
+def test_keyframes_and_round_trip_across_saves(history):
+    definitions = [f"Revision {i} of a fairly long definition of the term" for i in range(7)]
+    for old, new in zip(definitions, definitions[1:]):
+        history.record_change("term", old, new)
+        history.save()
+    
+    stored = read_file(history, "term")["term"]
+    assert ["text" in revision for revision in stored] == [False, False, True, False, False, True]
+    revisions = history.get_revisions("term", definitions[-1])
+    assert [text for _, text in revisions] == definitions[-2::-1]
+
+def test_not_read_until_needed(history):
+    with patch.object(history, '_read_bucket') as mock_read:
+        history.record_change("cat", "A small mammal", "A pet")
+        mock_read.assert_not_called()
+
+def test_save_touches_only_changed_buckets(history):
+    history.record_change("cat", "A small mammal", "A pet")
+    history.record_change("dog", "A loyal mammal", "A pet")
+    history.save()
+    
+    with patch('src.history.atomic_open', wraps=history_atomic_open) as mock_open:
+        history.record_change("cat", "A pet", "A feline")
+        history.save()
+    assert [call.args[0] for call in mock_open.call_args_list] == [history._bucket_path("cat")]
+    assert [text for _, text in history.get_revisions("dog", "A pet")] == ["A loyal mammal"]
+    assert [text for _, text in history.get_revisions("cat", "A feline")] == ["A pet", "A small mammal"]
+
+def test_save_up_to_generation(history):
+    history.record_change("cat", "A small mammal", "A domesticated mammal", generation=1)
+    history.record_change("cat", "A domesticated mammal", "A pet", generation=3)
+    history.save(2)
+    
+    assert [revision["text"] for revision in read_file(history, "cat")["cat"]] == ["A small mammal"]
+    assert [text for _, text in history.get_revisions("cat", "A pet")] == [
+        "A domesticated mammal", "A small mammal"
+    ]
+    history.save(4)
+    assert len(read_file(history, "cat")["cat"]) == 2
+
+def test_removal_saved_before_addition(history):
+    old = "A small domesticated carnivorous mammal with soft fur"
+    new = "A small domesticated carnivorous mammal with soft fur and whiskers"
+    history.record_removal("cat", old, generation=1)
+    history.record_addition("cat", new, generation=3)
+    history.save(2)
+    
+    # The delta needs the new definition, which the saved snapshot lacks
+    assert not os.path.exists(history.directory)
+    history.save(4)
+    assert "delta" in read_file(history, "cat")["cat"][0]
+    assert [text for _, text in history.get_revisions("cat", new)] == [old]
+
+def test_save_nothing_pending(history):
+    history.save()
+    assert not os.path.exists(history.directory)
+
+def test_failed_save_retried(history):
+    history.record_change("cat", "A small mammal", "A pet")
+    with patch('src.history.atomic_open', side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            history.save()
+    history.save()
+    assert [text for _, text in history.get_revisions("cat", "A pet")] == ["A small mammal"]
+
+def test_corrupt_file_ignored(history):
+    os.makedirs(history.directory)
+    with open(history._bucket_path("cat"), 'w') as f:
+        f.write("{not json")
+    assert history.get_revisions("cat", "A pet") == []
@@ -0,0 +1,76 @@
+import pytest
+from unittest.mock import patch
+import json
+import pickle
+from src.index_cache import IndexCache, CACHE_VERSION, encode_index, decode_index
+from src.search_index import build_index
+
+FINGERPRINT = {"size": 10, "mtime_ns": 1, "sha256": "abc"}
+
+@pytest.fixture
+def cache(tmp_path):
+    return IndexCache(str(tmp_path / "data.json.idx"))
+
+@pytest.fixture
+def index():
+    return build_index({"cat": {"definition": "A small mammal", "labels": ["animal"]}})
+
+def test_round_trip(cache, index):
+    cache.save(index, FINGERPRINT)
+    loaded = cache.load(dict(FINGERPRINT))
+    assert loaded.words == index.words
+    assert loaded.labels == index.labels
+    assert loaded.keys == index.keys
+
+def test_stale_fingerprint(cache, index):
+    cache.save(index, FINGERPRINT)
+    assert cache.load({**FINGERPRINT, "sha256": "def"}) is None
+    assert cache.load(None) is None
+
+def test_missing_file(cache):
+    assert cache.load(FINGERPRINT) is None
+
+def test_corrupt_file(cache, index):
+    cache.save(index, FINGERPRINT)
+    with open(cache.filepath, 'r+b') as f:
+        f.seek(-10, 2)
+        f.truncate()
+    assert cache.load(FINGERPRINT) is None
+
+def test_version_mismatch(cache, index):
+    cache.save(index, FINGERPRINT)
+    with patch('src.index_cache.CACHE_VERSION', CACHE_VERSION + 1):
+        assert cache.load(FINGERPRINT) is None
+
+def test_encode_round_trip():
+    index = build_index({
+        "Café": {"definition": "A coffee house", "labels": ["place"]},
+        "tea": {"definition": "A hot drink", "labels": ["drink", "place"]},
+    })
+    decoded = decode_index(encode_index(index))
+    assert decoded.keys == index.keys
+    assert decoded.words == index.words
+    assert decoded.labels == index.labels
+
+@pytest.mark.parametrize("body", [
+    b'{"terms": ["cat"], "keys": [null], "words": [["cat", 1]], "labels": []}\n\x05\x00\x00\x00',
+    b'{"terms": ["cat"], "keys": [null], "words": [["cat", 2]], "labels": []}\n\x00\x00\x00\x00',
+    b'{"terms": ["cat"], "keys": [], "words": [], "labels": []}\n',
+    b'{"terms": ["cat"]}\n',
+    b'{"terms": ["cat"], "keys": [null], "words": [], "labels": []}\n\x00\x00',
+    b'no postings',
+])
+def test_invalid_body(cache, body):
+    with open(cache.filepath, 'wb') as f:
+        f.write(json.dumps({"version": CACHE_VERSION, "fingerprint": FINGERPRINT}).encode() + b'\n' + body)
+    assert cache.load(FINGERPRINT) is None
+
+class Planted:
+    def __reduce__(self):
+        return (exec, ("raise SystemExit('cache code ran')",))
+
+def test_pickled_payload_never_executed(cache):
+    with open(cache.filepath, 'wb') as f:
+        f.write(json.dumps({"version": CACHE_VERSION, "fingerprint": FINGERPRINT}).encode() + b'\n')
+        f.write(pickle.dumps(Planted()))
+    assert cache.load(FINGERPRINT) is None
@@ -0,0 +1,73 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+from src.search_index import ScanIndex, build_index, tokenize
+
+@pytest.fixture
+def dictionary():
+    return {
+        "python": {"definition": "A programming language", "labels": ["code"]},
+        "cobra": {"definition": "A venomous snake", "labels": ["animal"]},
+        "boa": {"definition": "A large snake", "labels": ["animal", "large"]},
+    }
+
+def test_tokenize():
+    assert tokenize("Hello, hello World!") == {"hello", "world"}
+
+def test_find_words(dictionary):
+    index = build_index(dictionary)
+    assert index.find_words("snake") == {"cobra", "boa"}
+    assert index.find_words("large snake") == {"boa"}
+    assert index.find_words("python") == {"python"}
+    assert index.find_words("") == set()
+
+def test_find_labels(dictionary):
+    index = build_index(dictionary)
+    assert index.find_labels(["animal"]) == {"cobra", "boa"}
+    assert index.find_labels(["code", "large"]) == {"python", "boa"}
+    assert index.find_labels(["missing"]) == set()
+
+def test_remove(dictionary):
+    index = build_index(dictionary)
+    index.remove("boa", dictionary["boa"])
+    assert index.find_words("snake") == {"cobra"}
+    assert "large" not in index.labels
+
+def test_add_and_remove_label(dictionary):
+    index = build_index(dictionary)
+    index.add_label("python", "animal")
+    assert index.find_labels(["animal"]) == {"python", "cobra", "boa"}
+    index.remove_label("python", "animal")
+    assert index.find_labels(["animal"]) == {"cobra", "boa"}
+
+def test_parallel_build_matches_serial(dictionary):
+    serial = build_index(dictionary, workers=1)
+    parallel = build_index(dictionary, workers=2, threshold=0)
+    assert parallel.words == serial.words
+    assert parallel.labels == serial.labels
+
+def test_parallel_build_spawns_workers(dictionary):
+    with patch('src.search_index.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as mock_executor:
+        build_index(dictionary, workers=2, threshold=0)
+    assert mock_executor.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+
+def test_find_substring_ignores_case_and_accents():
+    index = build_index({
+        "Café": {"definition": "A coffee shop", "labels": []},
+        "Straße": {"definition": "A street", "labels": []},
+    })
+    assert index.find_substring("cafe") == {"Café"}
+    assert index.find_substring("STRASSE") == {"Straße"}
+    assert index.find_words("CAFÉ") == {"Café"}
+    assert index.keys["Café"] == "cafe"
+
+def test_scan_index_matches_search_index(dictionary):
+    index = build_index(dictionary)
+    scan = ScanIndex(dictionary)
+    for text in ("snake", "large snake", "COBRA", ""):
+        assert scan.find_words(text) == index.find_words(text)
+        assert scan.find_substring(text) == index.find_substring(text)
+    assert scan.find_labels(["animal", "code"]) == index.find_labels(["animal", "code"])
+    assert scan.all_labels() == index.all_labels()
+    assert scan.matches_substring("python", "TH") == index.matches_substring("python", "TH")
+    assert not scan.matches_substring("missing", "")
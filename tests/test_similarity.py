@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from src.similarity import SimilarityEngine, term_frequencies
+
+DOCUMENTS = {
+    "python": "a high level programming language with dynamic typing",
+    "ruby": "a dynamic programming language focused on simplicity",
+    "cobra": "a venomous snake found in asia and africa",
+    "viper": "a venomous snake with long hinged fangs",
+    "java": "a statically typed programming language for the jvm",
+}
+
+@pytest.fixture
+def engine():
+    engine = SimilarityEngine()
+    engine.build(DOCUMENTS)
+    return engine
+
+def test_term_frequencies():
+    assert term_frequencies("Snake, snake SNAKE café") == {"snake": 3, "cafe": 1}
+
+def test_most_similar(engine):
+    related = engine.most_similar("cobra", k=2)
+    assert related[0][0] == "viper"
+    assert 0 < related[0][1] <= 1
+    assert [term for term, _ in engine.most_similar("python", k=2)] == ["ruby", "java"]
+
+def test_most_similar_excludes_self_and_unrelated():
+    engine = SimilarityEngine()
+    engine.build({"cobra": "venomous snake", "viper": "venomous serpent", "java": "programming language"})
+    assert engine.most_similar("viper", k=10) == [("cobra", pytest.approx(0.5, abs=0.2))]
+
+def test_common_tokens_only_score_found_documents():
+    engine = SimilarityEngine()
+    engine.build({"q": "rare common", "x": "rare", "y": "common", "z": "common tail", "w": "other"})
+    assert {term for term, _ in engine.most_similar("q", k=10)} == {"x", "y", "z"}
+    with patch('src.similarity.MAX_WALKED_POSTINGS', 2):
+        # "common" is in three documents, so it is not walked to find new ones
+        assert [term for term, _ in engine.most_similar("q", k=10)] == ["x"]
+
+def test_most_similar_unknown(engine):
+    assert engine.most_similar("missing") == []
+
+def test_incremental_add_and_remove(engine):
+    engine.add("mamba", "a venomous snake found in africa")
+    assert engine.most_similar("cobra", k=1)[0][0] == "mamba"
+    engine.remove("mamba")
+    assert len(engine) == len(DOCUMENTS)
+    assert engine.most_similar("cobra", k=1)[0][0] == "viper"
+    engine.remove("missing")
+
+def test_incremental_matches_rebuild(engine):
+    engine.add("mamba", "a venomous snake found in africa")
+    rebuilt = SimilarityEngine()
+    rebuilt.build({**DOCUMENTS, "mamba": "a venomous snake found in africa"})
+    assert [term for term, _ in engine.most_similar("cobra")] == [term for term, _ in rebuilt.most_similar("cobra")]
@@ -2,7 +2,7 @@ import pytest
 import os
 import sys
 from unittest.mock import patch
-from src.utils import app_data_path
+from src.utils import app_data_path, normalize_key, deep_getsizeof
 
 def test_app_data_path_not_frozen():
     with patch('sys.frozen', False, create=True):
@@ -15,4 +15,17 @@ def test_app_data_path_frozen():
         with patch('sys.executable', '/path/to/exe'):
             path = app_data_path('test.txt')
             assert isinstance(path, str)
-            assert path.endswith('test.txt')
\ No newline at end of file
+            assert path.endswith('test.txt')
+
+def test_normalize_key():
+    assert normalize_key("Café") == normalize_key("cafe") == "cafe"
+    assert normalize_key("Straße") == "strasse"
+    assert normalize_key("ＡＢＣ") == "abc"
+
+def test_deep_getsizeof():
+    inner = ["a" * 100]
+    outer = {"x": inner, "y": inner}
+    assert deep_getsizeof(outer) > deep_getsizeof(inner) > sys.getsizeof(inner)
+    seen = set()
+    deep_getsizeof(inner, seen)
+    assert deep_getsizeof(inner, seen) == 0